@@ -26,10 +26,12 @@ License: MIT
 import numpy as np
 from scipy import ndimage, signal, spatial, stats
 from scipy.optimize import minimize
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, Union
 from dataclasses import dataclass
 import warnings
 
+from fft_backend import FFTBackend, get_fft_backend
+
 
 @dataclass
 class CairoSignature:
@@ -491,8 +493,19 @@ class CairoLatticeAnalyzer:
     Combines multiple detection methods to produce comprehensive signature.
     """
     
-    def __init__(self):
-        """Initialize all analysis components."""
+    def __init__(self,
+                 fft_backend: Optional[Union[str, FFTBackend]] = None,
+                 rng: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None):
+        """
+        Initialize all analysis components.
+        
+        Args:
+            fft_backend: FFT backend name or instance (numpy.fft if None)
+            rng: Seed, SeedSequence or Generator for the bootstrap null
+                realizations (fresh OS entropy if None)
+        """
+        self.fft = get_fft_backend(fft_backend)
+        self.rng = np.random.default_rng(rng)
         self.pentagon_detector = PentagonDetector()
         self.vertex_analyzer = VertexAnalyzer()
         self.angle_analyzer = AngleAnalyzer()
@@ -528,7 +541,7 @@ class CairoLatticeAnalyzer:
         
         # 4. Spatial periodicity (from power spectrum)
         print("  - Computing spatial periodicity...")
-        fft = np.fft.fft2(field)
+        fft = self.fft.fft2(field)
         power_2d = np.abs(fft)**2
         
         # Radial average
@@ -588,15 +601,15 @@ class CairoLatticeAnalyzer:
         obs_power, _ = self.symmetry_detector.detect_five_fold(field)
         
         # Generate bootstrap samples from Gaussian random field with same power spectrum
-        fft_obs = np.fft.fft2(field)
+        fft_obs = self.fft.fft2(field)
         power_spectrum = np.abs(fft_obs)
         
         bootstrap_powers = []
         for _ in range(n_bootstrap):
             # Random phases
-            random_phases = np.exp(2j * np.pi * np.random.rand(*field.shape))
+            random_phases = np.exp(2j * np.pi * self.rng.random(field.shape))
             fft_random = power_spectrum * random_phases
-            field_random = np.real(np.fft.ifft2(fft_random))
+            field_random = np.real(self.fft.ifft2(fft_random))
             
             # Compute five-fold power
             power, _ = self.symmetry_detector.detect_five_fold(field_random)
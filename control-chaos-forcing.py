@@ -26,10 +26,13 @@ License: MIT
 
 import numpy as np
 from scipy import ndimage, signal
-from typing import Tuple, Optional, Callable, List
+from typing import Tuple, Optional, Callable, List, Union
 from dataclasses import dataclass
 from enum import Enum
 
+from fft_backend import FFTBackend, get_fft_backend
+from imprint_library import coordinate_grids, default_library, gaussian
+
 
 class ForceType(Enum):
     """Types of forcing patterns."""
@@ -93,7 +96,8 @@ class ControlField:
     def __init__(self, 
                  grid_shape: Tuple[int, ...],
                  params: Optional[ControlParameters] = None,
-                 dx: float = 1.0):
+                 dx: float = 1.0,
+                 dtype=np.float64):
         """
         Initialize Control field generator.
         
@@ -101,11 +105,13 @@ class ControlField:
             grid_shape: Shape of spatial grid
             params: Control parameters
             dx: Grid spacing
+            dtype: Precision of the generated fields (float64 or float32)
         """
         self.grid_shape = grid_shape
         self.ndim = len(grid_shape)
         self.params = params or ControlParameters()
         self.dx = dx
+        self.dtype = np.dtype(dtype)
         
         # Create spatial mode patterns
         self._generate_spatial_modes()
@@ -118,9 +124,8 @@ class ControlField:
         """
         self.mode_patterns = []
         
-        # Create coordinate grids
-        coords = [np.arange(N) * self.dx for N in self.grid_shape]
-        grids = np.meshgrid(*coords, indexing='ij')
+        # Cached open coordinate grids (broadcast instead of a full meshgrid)
+        grids = coordinate_grids(tuple(self.grid_shape), self.dx)
         
         for k_mode in self.params.k_modes:
             if self.ndim == 1:
@@ -138,7 +143,7 @@ class ControlField:
             
             # Normalize
             pattern = pattern / np.max(np.abs(pattern))
-            self.mode_patterns.append(pattern)
+            self.mode_patterns.append(pattern.astype(self.dtype))
     
     def generate(self, t: float) -> np.ndarray:
         """
@@ -150,11 +155,11 @@ class ControlField:
         Returns:
             Control field φ_C(x, t)
         """
-        # Time-coherent oscillation
-        time_factor = np.cos(self.params.omega * t + self.params.phase)
+        # Time-coherent oscillation (a Python float keeps float32 fields float32)
+        time_factor = float(np.cos(self.params.omega * t + self.params.phase))
         
         # Sum over spatial modes
-        field = np.zeros(self.grid_shape)
+        field = np.zeros(self.grid_shape, dtype=self.dtype)
         for pattern in self.mode_patterns:
             field += pattern
         
@@ -178,17 +183,12 @@ class ControlField:
         Returns:
             Spatial envelope function
         """
-        coords = [np.arange(N) * self.dx for N in self.grid_shape]
-        grids = np.meshgrid(*coords, indexing='ij')
-        
-        # Center coordinates
-        centers = [N * self.dx / 2 for N in self.grid_shape]
-        
-        # Compute distance from center
-        r_squared = sum((g - c)**2 for g, c in zip(grids, centers))
-        
-        # Gaussian envelope
-        return np.exp(-r_squared / (2 * self.params.spatial_coherence**2))
+        # Centered separable Gaussian, memoized across calls and instances
+        return default_library.get(
+            'gaussian', dtype=self.dtype,
+            center=tuple(N / 2 for N in self.grid_shape), amplitude=1.0,
+            width=self.params.spatial_coherence,
+            grid_shape=tuple(self.grid_shape), dx=self.dx)
     
     def add_harmonic(self, k_mode: float, amplitude_factor: float = 1.0):
         """
@@ -213,7 +213,10 @@ class ChaosField:
     def __init__(self,
                  grid_shape: Tuple[int, ...],
                  params: Optional[ChaosParameters] = None,
-                 dx: float = 1.0):
+                 dx: float = 1.0,
+                 fft_backend: Optional[Union[str, FFTBackend]] = None,
+                 rng: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None,
+                 dtype=np.float64):
         """
         Initialize Chaos field generator.
         
@@ -221,11 +224,19 @@ class ChaosField:
             grid_shape: Shape of spatial grid
             params: Chaos parameters
             dx: Grid spacing
+            fft_backend: FFT backend name or instance (numpy.fft if None)
+            rng: Seed, SeedSequence or Generator for the noise stream
+                (fresh OS entropy if None)
+            dtype: Precision of the generated fields (float64 or float32;
+                the FFTs then run in complex64)
         """
         self.grid_shape = grid_shape
         self.ndim = len(grid_shape)
         self.params = params or ChaosParameters()
         self.dx = dx
+        self.dtype = np.dtype(dtype)
+        self.fft = get_fft_backend(fft_backend)
+        self.rng = np.random.default_rng(rng)
         
         # Cache for temporal correlation
         self._noise_cache = None
@@ -243,7 +254,7 @@ class ChaosField:
         # Create wavenumber grids
         k_grids = []
         for N in self.grid_shape:
-            k = 2 * np.pi * np.fft.fftfreq(N, d=self.dx)
+            k = 2 * np.pi * self.fft.fftfreq(N, d=self.dx)
             k_grids.append(k)
         
         k_arrays = np.meshgrid(*k_grids, indexing='ij')
@@ -258,6 +269,9 @@ class ChaosField:
         
         # Normalize
         self.noise_spectrum = self.noise_spectrum / np.mean(self.noise_spectrum)
+        
+        # Amplitude filter applied to every draw, stored at working precision
+        self._amplitude_filter = np.sqrt(self.noise_spectrum).astype(self.dtype)
     
     def _generate_colored_noise(self) -> np.ndarray:
         """
@@ -267,14 +281,14 @@ class ChaosField:
             Noise field with desired power spectrum
         """
         # White noise in Fourier space
-        noise_fft = (np.random.randn(*self.grid_shape) + 
-                    1j * np.random.randn(*self.grid_shape))
+        noise_fft = (self.rng.standard_normal(self.grid_shape, dtype=self.dtype) + 
+                    1j * self.rng.standard_normal(self.grid_shape, dtype=self.dtype))
         
         # Apply power spectrum
-        noise_fft = noise_fft * np.sqrt(self.noise_spectrum)
+        noise_fft = noise_fft * self._amplitude_filter
         
         # Transform to real space
-        noise = np.real(np.fft.ifftn(noise_fft))
+        noise = np.real(self.fft.ifftn(noise_fft))
         
         # Additional spatial smoothing
         if self.params.spatial_correlation > 0:
@@ -308,12 +322,12 @@ class ChaosField:
         # Apply temporal decorrelation if specified
         if self.params.temporal_correlation < np.inf:
             # Exponential decay factor
-            decay = np.exp(-time_since_refresh / self.params.temporal_correlation)
+            decay = float(np.exp(-time_since_refresh / self.params.temporal_correlation))
             
             # Mix cached noise with new noise
             if decay < 0.9:  # Refresh when decorrelated
                 new_noise = self._generate_colored_noise()
-                field = decay * self._noise_cache + np.sqrt(1 - decay**2) * new_noise
+                field = decay * self._noise_cache + float(np.sqrt(1 - decay**2)) * new_noise
                 self._noise_cache = field
             else:
                 field = self._noise_cache
@@ -327,6 +341,26 @@ class ChaosField:
         """Reset temporal correlation cache."""
         self._noise_cache = None
         self._last_refresh_time = -np.inf
+    
+    def get_state(self) -> dict:
+        """
+        Snapshot of the generator state (for checkpointing).
+        
+        Returns:
+            RNG bit-generator state, noise cache and last refresh time
+        """
+        return {
+            'rng': self.rng.bit_generator.state,
+            'noise_cache': None if self._noise_cache is None else self._noise_cache.copy(),
+            'last_refresh_time': float(self._last_refresh_time),
+        }
+    
+    def set_state(self, state: dict):
+        """Restore a state returned by get_state()."""
+        self.rng.bit_generator.state = state['rng']
+        cache = state['noise_cache']
+        self._noise_cache = None if cache is None else np.array(cache)
+        self._last_refresh_time = state['last_refresh_time']
 
 
 class ControlChaosForcing:
@@ -341,7 +375,10 @@ class ControlChaosForcing:
                  grid_shape: Tuple[int, ...],
                  control_params: Optional[ControlParameters] = None,
                  chaos_params: Optional[ChaosParameters] = None,
-                 dx: float = 1.0):
+                 dx: float = 1.0,
+                 fft_backend: Optional[Union[str, FFTBackend]] = None,
+                 rng: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None,
+                 dtype=np.float64):
         """
         Initialize combined forcing generator.
         
@@ -350,13 +387,20 @@ class ControlChaosForcing:
             control_params: Control field parameters
             chaos_params: Chaos field parameters
             dx: Grid spacing
+            fft_backend: FFT backend name or instance for the Chaos generator
+            rng: Seed, SeedSequence or Generator; the Chaos generator gets
+                a child stream spawned from it
+            dtype: Precision of the generated fields (float64 or float32)
         """
         self.grid_shape = grid_shape
         self.dx = dx
+        self.dtype = np.dtype(dtype)
+        self.rng = np.random.default_rng(rng)
         
         # Initialize component generators
-        self.control = ControlField(grid_shape, control_params, dx)
-        self.chaos = ChaosField(grid_shape, chaos_params, dx)
+        self.control = ControlField(grid_shape, control_params, dx, dtype=dtype)
+        self.chaos = ChaosField(grid_shape, chaos_params, dx, fft_backend=fft_backend,
+                                rng=self.rng.spawn(1)[0], dtype=dtype)
         
         # Balance parameter
         self.control_fraction = 0.5  # Equal by default
@@ -390,7 +434,21 @@ class ControlChaosForcing:
         Args:
             control_fraction: Fraction of Control (0=pure Chaos, 1=pure Control)
         """
-        self.control_fraction = np.clip(control_fraction, 0.0, 1.0)
+        self.control_fraction = float(np.clip(control_fraction, 0.0, 1.0))
+    
+    def get_state(self) -> dict:
+        """Snapshot of the generator state (for checkpointing)."""
+        return {
+            'rng': self.rng.bit_generator.state,
+            'chaos': self.chaos.get_state(),
+            'control_fraction': float(self.control_fraction),
+        }
+    
+    def set_state(self, state: dict):
+        """Restore a state returned by get_state()."""
+        self.rng.bit_generator.state = state['rng']
+        self.chaos.set_state(state['chaos'])
+        self.control_fraction = state['control_fraction']
     
     def sweep_balance(self, 
                      t: float,
@@ -428,7 +486,8 @@ class VacuumStructure:
                  wavelength: float = 10.0,
                  amplitude: float = 0.3,
                  dx: float = 1.0,
-                 lattice_type: str = 'hexagonal'):
+                 lattice_type: str = 'hexagonal',
+                 dtype=np.float64):
         """
         Initialize vacuum structure generator.
         
@@ -438,15 +497,17 @@ class VacuumStructure:
             amplitude: Pattern amplitude
             dx: Grid spacing
             lattice_type: Type of lattice ('hexagonal', 'pentagonal', 'square')
+            dtype: Precision of the stored pattern (float64 or float32)
         """
         self.grid_shape = grid_shape
         self.wavelength = wavelength
         self.amplitude = amplitude
         self.dx = dx
         self.lattice_type = lattice_type
+        self.dtype = np.dtype(dtype)
         
-        # Generate static pattern
-        self.pattern = self._generate_pattern()
+        # Generate static pattern (built in float64, stored at dtype)
+        self.pattern = self._generate_pattern().astype(self.dtype)
     
     def _generate_pattern(self) -> np.ndarray:
         """
@@ -464,23 +525,17 @@ class VacuumStructure:
         else:
             raise ValueError(f"Unknown lattice type: {self.lattice_type}")
     
+    def _lattice(self, name: str) -> np.ndarray:
+        """Look up a lattice pattern in the shared imprint library."""
+        return default_library.get(name, amplitude=self.amplitude,
+                                   wavelength=self.wavelength,
+                                   grid_shape=tuple(self.grid_shape),
+                                   dx=self.dx)
+    
     def _hexagonal_pattern(self) -> np.ndarray:
         """Create hexagonal lattice (6-fold symmetry)."""
-        if len(self.grid_shape) != 2:
-            raise ValueError("Hexagonal pattern only for 2D grids")
-        
-        x = np.arange(self.grid_shape[0]) * self.dx
-        y = np.arange(self.grid_shape[1]) * self.dx
-        X, Y = np.meshgrid(x, y, indexing='ij')
-        
-        k = 2 * np.pi / self.wavelength
-        
         # Three plane waves at 120° create hexagonal pattern
-        pattern = (np.cos(k * X) + 
-                  np.cos(k * (0.5 * X - np.sqrt(3)/2 * Y)) +
-                  np.cos(k * (0.5 * X + np.sqrt(3)/2 * Y)))
-        
-        return self.amplitude * pattern / 3.0
+        return self._lattice('hexagonal')
     
     def _pentagonal_pattern(self) -> np.ndarray:
         """
@@ -489,39 +544,11 @@ class VacuumStructure:
         True Cairo pentagonal tiling is aperiodic, but we approximate
         with five plane waves at 72° angles.
         """
-        if len(self.grid_shape) != 2:
-            raise ValueError("Pentagonal pattern only for 2D grids")
-        
-        x = np.arange(self.grid_shape[0]) * self.dx
-        y = np.arange(self.grid_shape[1]) * self.dx
-        X, Y = np.meshgrid(x, y, indexing='ij')
-        
-        k = 2 * np.pi / self.wavelength
-        
-        # Five plane waves at 72° create pentagonal approximation
-        pattern = np.zeros_like(X)
-        for i in range(5):
-            angle = 2 * np.pi * i / 5
-            kx = k * np.cos(angle)
-            ky = k * np.sin(angle)
-            pattern += np.cos(kx * X + ky * Y)
-        
-        return self.amplitude * pattern / 5.0
+        return self._lattice('pentagonal')
     
     def _square_pattern(self) -> np.ndarray:
         """Create square lattice (4-fold symmetry)."""
-        if len(self.grid_shape) != 2:
-            raise ValueError("Square pattern only for 2D grids")
-        
-        x = np.arange(self.grid_shape[0]) * self.dx
-        y = np.arange(self.grid_shape[1]) * self.dx
-        X, Y = np.meshgrid(x, y, indexing='ij')
-        
-        k = 2 * np.pi / self.wavelength
-        
-        pattern = np.cos(k * X) + np.cos(k * Y)
-        
-        return self.amplitude * pattern / 2.0
+        return self._lattice('square')
     
     def get_pattern(self) -> np.ndarray:
         """Return the static vacuum pattern."""
@@ -606,12 +633,8 @@ def create_particle_imprint(grid_shape: Tuple[int, ...],
     if center is None:
         center = tuple(N / 2 for N in grid_shape)
     
-    coords = [np.arange(N) * dx for N in grid_shape]
-    grids = np.meshgrid(*coords, indexing='ij')
-    
-    r_squared = sum((g - c * dx)**2 for g, c in zip(grids, center))
-    
-    return amplitude * np.exp(-r_squared / (2 * width**2))
+    # Separable: outer product of 1D Gaussian factors
+    return gaussian(center, amplitude, width, grid_shape, dx)
 
 
 # ============================================================================
@@ -0,0 +1,506 @@
+"""
+FFT Backend
+===========
+
+Pluggable FFT backend shared by the spectral modules (KRAM evolution solver,
+Control-Chaos forcing, Cairo Q-Lattice analysis).
+
+Every spectral call site goes through an FFTBackend instance chosen at
+construction time, so switching from single-threaded numpy.fft to a
+multi-threaded transform does not require touching the physics code.
+
+Available backends:
+    - 'numpy':  numpy.fft (always available, single-threaded)
+    - 'scipy':  scipy.fft with a configurable number of worker threads
+    - 'pyfftw': cached FFTW plans, multi-threaded, with wisdom persisted
+                to disk so plans are only measured once per machine
+
+Usage:
+    fft = get_fft_backend('scipy', workers=32)
+    solver = KRAMSolver((1024, 1024), fft_backend=fft)
+
+Author: David Noel Lynch
+Date: 2025
+License: MIT
+"""
+
+import os
+import pickle
+import tempfile
+import threading
+import numpy as np
+from typing import Tuple, Optional, Union, Dict
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:  # pragma: no cover - scipy is a core dependency
+    scipy_fft = None
+
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+
+# numpy >= 2.0 accepts an ``out`` argument on all numpy.fft transforms
+_NUMPY_FFT_HAS_OUT = np.lib.NumpyVersion(np.__version__) >= '2.0.0'
+
+
+def _store(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    """Copy a transform result into ``out`` if one was given."""
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+class FFTBackend:
+    """
+    Base class for FFT backends.
+
+    Transforms follow the numpy.fft conventions (unnormalized forward,
+    1/N-normalized inverse). Subclasses implement _transform(); the public
+    methods only normalize arguments.
+    """
+
+    name = 'base'
+
+    def fftn(self, a: np.ndarray,
+             axes: Optional[Tuple[int, ...]] = None,
+             out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Complex forward N-D transform."""
+        return self._transform('fftn', a, None, axes, out)
+
+    def ifftn(self, a: np.ndarray,
+              axes: Optional[Tuple[int, ...]] = None,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Complex inverse N-D transform."""
+        return self._transform('ifftn', a, None, axes, out)
+
+    def rfftn(self, a: np.ndarray,
+              axes: Optional[Tuple[int, ...]] = None,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Real-to-complex forward N-D transform (half-spectrum on last axis)."""
+        return self._transform('rfftn', a, None, axes, out)
+
+    def irfftn(self, a: np.ndarray,
+               s: Tuple[int, ...],
+               axes: Optional[Tuple[int, ...]] = None,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Complex-to-real inverse N-D transform.
+
+        Args:
+            a: Half-spectrum array
+            s: Real-space shape along the transformed axes (required, since
+               the length of the last axis is ambiguous otherwise)
+            axes: Transformed axes (defaults to the last len(s) axes)
+            out: Optional real output buffer
+        """
+        if axes is None:
+            axes = tuple(range(-len(s), 0))
+        return self._transform('irfftn', a, tuple(s), axes, out)
+
+    def fft2(self, a: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Complex forward transform over the last two axes."""
+        return self.fftn(a, axes=(-2, -1), out=out)
+
+    def ifft2(self, a: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Complex inverse transform over the last two axes."""
+        return self.ifftn(a, axes=(-2, -1), out=out)
+
+    @staticmethod
+    def fftfreq(n: int, d: float = 1.0) -> np.ndarray:
+        """Sample frequencies for the full-spectrum layout."""
+        return np.fft.fftfreq(n, d=d)
+
+    @staticmethod
+    def rfftfreq(n: int, d: float = 1.0) -> np.ndarray:
+        """Sample frequencies for the half-spectrum (last axis) layout."""
+        return np.fft.rfftfreq(n, d=d)
+
+    def _transform(self, kind: str, a: np.ndarray, s: Optional[Tuple[int, ...]],
+                   axes: Optional[Tuple[int, ...]],
+                   out: Optional[np.ndarray]) -> np.ndarray:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class NumpyFFTBackend(FFTBackend):
+    """numpy.fft backend (single-threaded reference implementation)."""
+
+    name = 'numpy'
+
+    def _transform(self, kind, a, s, axes, out):
+        func = getattr(np.fft, kind)
+        if _NUMPY_FFT_HAS_OUT:
+            return func(a, s=s, axes=axes, out=out)
+        return _store(func(a, s=s, axes=axes), out)
+
+
+class ScipyFFTBackend(FFTBackend):
+    """
+    scipy.fft backend with multi-threaded execution.
+
+    scipy.fft splits a multidimensional transform over ``workers`` threads
+    (negative values count back from os.cpu_count()).
+    """
+
+    name = 'scipy'
+
+    def __init__(self, workers: int = -1):
+        """
+        Initialize scipy.fft backend.
+
+        Args:
+            workers: Number of worker threads (-1 uses all cores)
+        """
+        if scipy_fft is None:
+            raise ImportError("scipy is required for the 'scipy' FFT backend")
+        self.workers = workers
+
+    def _transform(self, kind, a, s, axes, out):
+        func = getattr(scipy_fft, kind)
+        return _store(func(a, s=s, axes=axes, workers=self.workers), out)
+
+    def __repr__(self) -> str:
+        return f"ScipyFFTBackend(workers={self.workers})"
+
+
+class PyFFTWBackend(FFTBackend):
+    """
+    pyFFTW backend with cached plans and persistent wisdom.
+
+    One FFTW plan is built per (kind, shape, dtype, axes) and reused for
+    every later call with the same layout. Accumulated wisdom is written to
+    ``wisdom_file`` whenever a new plan is created and loaded back on
+    construction, so expensive FFTW_MEASURE/FFTW_PATIENT planning is paid
+    once per machine rather than once per run.
+    """
+
+    name = 'pyfftw'
+
+    _INPUT_DTYPES = {
+        'fftn': np.complex128, 'ifftn': np.complex128,
+        'rfftn': np.float64, 'irfftn': np.complex128,
+    }
+
+    def __init__(self,
+                 threads: Optional[int] = None,
+                 planner_effort: str = 'FFTW_MEASURE',
+                 wisdom_file: Optional[str] = None):
+        """
+        Initialize pyFFTW backend.
+
+        Args:
+            threads: Number of FFTW threads (defaults to os.cpu_count())
+            planner_effort: FFTW planner flag ('FFTW_ESTIMATE', 'FFTW_MEASURE',
+                'FFTW_PATIENT' or 'FFTW_EXHAUSTIVE')
+            wisdom_file: Path used to load and persist FFTW wisdom
+        """
+        if pyfftw is None:
+            raise ImportError("pyfftw is required for the 'pyfftw' FFT backend")
+        self.threads = threads or os.cpu_count() or 1
+        self.planner_effort = planner_effort
+        self.wisdom_file = wisdom_file
+        self._plans: Dict[tuple, 'pyfftw.FFTW'] = {}
+        self._lock = threading.Lock()
+        self.load_wisdom()
+
+    def load_wisdom(self):
+        """Import FFTW wisdom from wisdom_file if it exists."""
+        if self.wisdom_file and os.path.exists(self.wisdom_file):
+            with open(self.wisdom_file, 'rb') as f:
+                pyfftw.import_wisdom(pickle.load(f))
+
+    def save_wisdom(self):
+        """Atomically write the accumulated FFTW wisdom to wisdom_file."""
+        if not self.wisdom_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self.wisdom_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(pyfftw.export_wisdom(), f)
+            os.replace(tmp_path, self.wisdom_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _plan(self, kind: str, a: np.ndarray, s, axes) -> 'pyfftw.FFTW':
+        """Return the cached plan for this layout, building it if needed."""
+        in_dtype = np.dtype(self._INPUT_DTYPES[kind])
+        if a.dtype in (np.float32, np.complex64):
+            in_dtype = np.dtype(np.float32 if kind == 'rfftn' else np.complex64)
+
+        if axes is None:
+            axes = tuple(range(a.ndim))
+        axes = tuple(ax % a.ndim for ax in axes)
+        key = (kind, a.shape, in_dtype.str, axes, s)
+
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                return plan
+
+            complex_dtype = np.complex64 if in_dtype in (np.float32, np.complex64) else np.complex128
+            real_dtype = np.float32 if complex_dtype == np.complex64 else np.float64
+
+            in_array = pyfftw.empty_aligned(a.shape, dtype=in_dtype)
+            if kind == 'rfftn':
+                out_shape = list(a.shape)
+                out_shape[axes[-1]] = a.shape[axes[-1]] // 2 + 1
+                out_array = pyfftw.empty_aligned(tuple(out_shape), dtype=complex_dtype)
+            elif kind == 'irfftn':
+                out_shape = list(a.shape)
+                for ax, n in zip(axes, s):
+                    out_shape[ax] = n
+                out_array = pyfftw.empty_aligned(tuple(out_shape), dtype=real_dtype)
+            else:
+                out_array = pyfftw.empty_aligned(a.shape, dtype=complex_dtype)
+
+            direction = 'FFTW_BACKWARD' if kind in ('ifftn', 'irfftn') else 'FFTW_FORWARD'
+            plan = pyfftw.FFTW(in_array, out_array, axes=axes, direction=direction,
+                               flags=(self.planner_effort,), threads=self.threads)
+            self._plans[key] = plan
+            self.save_wisdom()
+
+        return plan
+
+    def _transform(self, kind, a, s, axes, out):
+        a = np.asarray(a)
+        plan = self._plan(kind, a, s, axes)
+        plan.input_array[...] = a
+        plan(normalise_idft=True)
+        if out is None:
+            return plan.output_array.copy()
+        out[...] = plan.output_array
+        return out
+
+    def __repr__(self) -> str:
+        return (f"PyFFTWBackend(threads={self.threads}, "
+                f"planner_effort='{self.planner_effort}', wisdom_file={self.wisdom_file!r})")
+
+
+_BACKENDS = {
+    'numpy': NumpyFFTBackend,
+    'scipy': ScipyFFTBackend,
+    'pyfftw': PyFFTWBackend,
+}
+
+
+def get_fft_backend(backend: Optional[Union[str, FFTBackend]] = None,
+                    **kwargs) -> FFTBackend:
+    """
+    Resolve an FFT backend specification.
+
+    Args:
+        backend: Backend name ('numpy', 'scipy', 'pyfftw'), an existing
+            FFTBackend instance (returned unchanged), or None for numpy
+        **kwargs: Passed to the backend constructor (e.g. workers=32 for
+            scipy, threads=32 / wisdom_file='fftw.wisdom' for pyfftw)
+
+    Returns:
+        FFTBackend instance
+    """
+    if isinstance(backend, FFTBackend):
+        return backend
+    if backend is None:
+        backend = 'numpy'
+    try:
+        backend_cls = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown FFT backend: {backend}")
+    return backend_cls(**kwargs)
+
+
+# ============================================================================
+# Slab-decomposed distributed transforms
+# ============================================================================
+
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+
+class SerialComm:
+    """
+    Single-process stand-in for an mpi4py communicator.
+
+    Implements the subset of the mpi4py.MPI.Comm interface used by
+    SlabFFTBackend and DistributedKRAMSolver, so distributed code runs
+    unchanged (as one rank) when mpi4py is not installed.
+    """
+
+    def Get_rank(self) -> int:
+        return 0
+
+    def Get_size(self) -> int:
+        return 1
+
+    def Barrier(self):
+        pass
+
+    def Alltoallv(self, sendbuf, recvbuf):
+        recvbuf[0][...] = sendbuf[0]
+
+    def Gatherv(self, sendbuf, recvbuf, root: int = 0):
+        recvbuf[0][...] = sendbuf
+
+    def Scatterv(self, sendbuf, recvbuf, root: int = 0):
+        recvbuf[...] = sendbuf[0]
+
+    def gather(self, value, root: int = 0):
+        return [value]
+
+    def allreduce(self, value, op=None):
+        return value
+
+    def bcast(self, value, root: int = 0):
+        return value
+
+
+def get_comm(comm=None):
+    """
+    Resolve a communicator: the given one, MPI.COMM_WORLD if mpi4py is
+    installed, or a SerialComm otherwise.
+    """
+    if comm is not None:
+        return comm
+    if MPI is not None:
+        return MPI.COMM_WORLD
+    return SerialComm()
+
+
+def split_sizes(n: int, parts: int) -> np.ndarray:
+    """Sizes of a near-even split of n items into parts (larger parts first)."""
+    return np.array([n // parts + (1 if i < n % parts else 0) for i in range(parts)])
+
+
+class SlabFFTBackend(FFTBackend):
+    """
+    Parallel real-to-complex FFT over a slab decomposition.
+
+    Real fields are split along axis 0 (each rank holds a slab of whole
+    rows); spectra are split along axis 1 (the "transposed" layout), so
+    each rank holds every k_0 of a block of k_1 columns. A forward
+    transform runs the local rfft over axes 1.., redistributes with one
+    Alltoallv, and finishes with a complex FFT along axis 0; the inverse
+    mirrors this. Per-rank transforms go through a regular FFTBackend, so
+    scipy/pyfftw threading still applies within each rank.
+
+    Only rfftn/irfftn over all grid axes are supported, which is all the
+    KRAM solver needs.
+    """
+
+    name = 'slab'
+
+    def __init__(self,
+                 grid_shape: Tuple[int, ...],
+                 comm=None,
+                 local_backend: Optional[Union[str, FFTBackend]] = None):
+        """
+        Initialize slab-decomposed FFT.
+
+        Args:
+            grid_shape: Global real-space grid shape (at least 2 axes)
+            comm: mpi4py communicator (see get_comm)
+            local_backend: Backend for the per-rank transforms
+        """
+        if len(grid_shape) < 2:
+            raise ValueError("Slab decomposition needs at least a 2D grid")
+        self.grid_shape = tuple(grid_shape)
+        self.comm = get_comm(comm)
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+        self.local = get_fft_backend(local_backend)
+
+        self.spectral_grid_shape = self.grid_shape[:-1] + (self.grid_shape[-1] // 2 + 1,)
+        if self.grid_shape[0] < self.size or self.spectral_grid_shape[1] < self.size:
+            raise ValueError(f"Grid {self.grid_shape} is too small for {self.size} ranks")
+
+        # Real-space rows (axis 0) and spectral columns (axis 1) of every rank
+        self.row_sizes = split_sizes(self.grid_shape[0], self.size)
+        self.col_sizes = split_sizes(self.spectral_grid_shape[1], self.size)
+        self.row_starts = np.concatenate([[0], np.cumsum(self.row_sizes)[:-1]])
+        self.col_starts = np.concatenate([[0], np.cumsum(self.col_sizes)[:-1]])
+
+        r0, c0 = self.row_starts[self.rank], self.col_starts[self.rank]
+        self.row_slice = slice(r0, r0 + self.row_sizes[self.rank])
+        self.col_slice = slice(c0, c0 + self.col_sizes[self.rank])
+        self.local_shape = (int(self.row_sizes[self.rank]),) + self.grid_shape[1:]
+        self.local_spectral_shape = ((self.grid_shape[0], int(self.col_sizes[self.rank])) +
+                                     self.spectral_grid_shape[2:])
+
+        # Elements of trailing axes carried along by each redistribution
+        self._trailing = int(np.prod(self.spectral_grid_shape[2:]))
+
+    def _check_axes(self, a: np.ndarray, axes):
+        if axes is not None and tuple(ax % a.ndim for ax in axes) != tuple(range(a.ndim)):
+            raise ValueError("SlabFFTBackend only transforms over all grid axes")
+
+    def _transform(self, kind, a, s, axes, out):
+        raise NotImplementedError("SlabFFTBackend supports rfftn and irfftn only")
+
+    def rfftn(self, a: np.ndarray,
+              axes: Optional[Tuple[int, ...]] = None,
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Forward transform of a local real slab into the local spectral block."""
+        self._check_axes(a, axes)
+        ndim = len(self.grid_shape)
+        partial = self.local.rfftn(a, axes=tuple(range(1, ndim)))
+
+        # Send column block j of our rows to rank j
+        n_rows, trailing = self.local_shape[0], self._trailing
+        send = np.concatenate([partial[:, c0:c0 + n].ravel()
+                               for c0, n in zip(self.col_starts, self.col_sizes)])
+        recv = np.empty(int(np.prod(self.local_spectral_shape)), dtype=partial.dtype)
+        send_counts = n_rows * self.col_sizes * trailing
+        recv_counts = self.row_sizes * self.col_sizes[self.rank] * trailing
+        self.comm.Alltoallv(
+            [send, (send_counts, np.concatenate([[0], np.cumsum(send_counts)[:-1]]))],
+            [recv, (recv_counts, np.concatenate([[0], np.cumsum(recv_counts)[:-1]]))])
+
+        # Blocks arrive in rank (= row) order, forming whole k_0 columns
+        spectrum = recv.reshape(self.local_spectral_shape)
+        return self.local.fftn(spectrum, axes=(0,), out=out)
+
+    def irfftn(self, a: np.ndarray,
+               s: Tuple[int, ...],
+               axes: Optional[Tuple[int, ...]] = None,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Inverse transform of a local spectral block into the local real slab."""
+        self._check_axes(a, axes)
+        if tuple(s) != self.grid_shape:
+            raise ValueError(f"SlabFFTBackend was built for grid {self.grid_shape}")
+        ndim = len(self.grid_shape)
+        columns = self.local.ifftn(a, axes=(0,))
+
+        # Send row block i of our columns back to rank i
+        n_cols, trailing = self.local_spectral_shape[1], self._trailing
+        send = np.ascontiguousarray(columns).ravel()
+        n_rows = self.local_shape[0]
+        recv = np.empty(n_rows * self.spectral_grid_shape[1] * trailing, dtype=send.dtype)
+        send_counts = self.row_sizes * n_cols * trailing
+        recv_counts = n_rows * self.col_sizes * trailing
+        recv_displs = np.concatenate([[0], np.cumsum(recv_counts)[:-1]])
+        self.comm.Alltoallv(
+            [send, (send_counts, np.concatenate([[0], np.cumsum(send_counts)[:-1]]))],
+            [recv, (recv_counts, recv_displs)])
+
+        blocks = [recv[d:d + c].reshape((n_rows, n) + self.spectral_grid_shape[2:])
+                  for d, c, n in zip(recv_displs, recv_counts, self.col_sizes)]
+        partial = np.concatenate(blocks, axis=1)
+        return self.local.irfftn(partial, s=self.grid_shape[1:],
+                                 axes=tuple(range(1, ndim)), out=out)
+
+    def __repr__(self) -> str:
+        return (f"SlabFFTBackend(grid_shape={self.grid_shape}, ranks={self.size}, "
+                f"local={self.local!r})")
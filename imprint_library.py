@@ -0,0 +1,672 @@
+"""
+Imprint Library
+===============
+
+Cached construction of the static imprint and forcing patterns shared by the
+KRAM evolution solver and the Control-Chaos forcing module.
+
+Forcing closures are called once per time step and most of what they return
+is static: a vacuum lattice, a Gaussian envelope, a smoothing kernel. Building
+those from full N-D meshgrids every call spends most of the step in
+transcendental functions. This module avoids that three ways:
+
+    - 1D coordinate axes are cached per (grid_shape, dx) and exposed as
+      broadcastable open grids, so no full meshgrid is ever materialized
+    - Gaussians and plane waves are separable, so they are built from 1D
+      factors combined by outer products (N^(1/d) transcendental evaluations
+      per axis instead of N)
+    - ImprintLibrary memoizes whole patterns by their parameters with LRU
+      eviction and hands out read-only views, so a forcing closure can look a
+      pattern up every step at dictionary cost
+
+For many moving particles, ParticleDeposition writes J_imprint with local
+stencils (cloud-in-cell or truncated Gaussian) or one FFT convolution, so the
+cost scales with n_particles * stencil rather than n_particles * grid size.
+
+Usage:
+    vacuum = default_library.get('hex_lattice', amplitude=0.2,
+                                 wavelength=8.0, grid_shape=(256, 256))
+    J = gaussian_sum(centers, amplitudes, width=3.0, grid_shape=(256, 256))
+
+    deposit = ParticleDeposition((256, 256), method='gaussian', width=3.0)
+    J = deposit.deposit(positions, charges)
+
+Author: David Noel Lynch
+Date: 2025
+License: MIT
+"""
+
+import functools
+from collections import OrderedDict
+import numpy as np
+from typing import Tuple, Optional, Callable, Dict, Sequence, Union
+
+from fft_backend import get_fft_backend
+
+
+def _read_only(a: np.ndarray) -> np.ndarray:
+    """Mark a cached array read-only so callers cannot corrupt the cache."""
+    a.flags.writeable = False
+    return a
+
+
+@functools.lru_cache(maxsize=32)
+def coordinate_axes(grid_shape: Tuple[int, ...],
+                    dx: float = 1.0) -> Tuple[np.ndarray, ...]:
+    """
+    1D physical coordinates x_i = i*dx along every grid axis (cached).
+
+    Args:
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+
+    Returns:
+        One read-only 1D array per axis
+    """
+    return tuple(_read_only(np.arange(N) * dx) for N in grid_shape)
+
+
+@functools.lru_cache(maxsize=32)
+def coordinate_grids(grid_shape: Tuple[int, ...],
+                     dx: float = 1.0) -> Tuple[np.ndarray, ...]:
+    """
+    Open (sparse) coordinate grids, broadcastable to grid_shape (cached).
+
+    Equivalent to np.meshgrid(..., indexing='ij', sparse=True): axis i has
+    shape (1, ..., N_i, ..., 1), so expressions such as x**2 + y**2 broadcast
+    to the full grid without storing d full-size coordinate arrays.
+
+    Args:
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+
+    Returns:
+        One read-only open grid per axis
+    """
+    ndim = len(grid_shape)
+    grids = []
+    for axis, x in enumerate(coordinate_axes(grid_shape, dx)):
+        shape = [1] * ndim
+        shape[axis] = x.size
+        grids.append(_read_only(x.reshape(shape)))
+    return tuple(grids)
+
+
+def outer_product(factors: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Combine 1D factors f_i(x_i) into the separable field prod_i f_i(x_i).
+
+    Args:
+        factors: One 1D array per axis
+
+    Returns:
+        Array of shape (len(f_0), len(f_1), ...)
+    """
+    return functools.reduce(np.multiply.outer, factors)
+
+
+def gaussian_factors(center: Tuple[float, ...],
+                     width: float,
+                     grid_shape: Tuple[int, ...],
+                     dx: float = 1.0) -> list:
+    """
+    1D factors exp(-(x_i - c_i dx)² / 2w²) of an N-D Gaussian.
+
+    Args:
+        center: Center coordinates (in grid units)
+        width: Gaussian width (sigma)
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+
+    Returns:
+        List of one 1D array per axis
+    """
+    axes = coordinate_axes(tuple(grid_shape), dx)
+    return [np.exp(-(x - c * dx)**2 / (2 * width**2))
+            for x, c in zip(axes, center)]
+
+
+def gaussian(center: Tuple[float, ...],
+             amplitude: float,
+             width: float,
+             grid_shape: Tuple[int, ...],
+             dx: float = 1.0) -> np.ndarray:
+    """
+    Separable Gaussian A exp(-|x - c dx|² / 2w²) built from 1D factors.
+
+    Args:
+        center: Center coordinates (in grid units)
+        amplitude: Peak amplitude
+        width: Gaussian width (sigma)
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+
+    Returns:
+        Gaussian field
+    """
+    factors = gaussian_factors(center, width, grid_shape, dx)
+    factors[0] = amplitude * factors[0]
+    return outer_product(factors)
+
+
+def gaussian_sum(centers: np.ndarray,
+                 amplitudes: np.ndarray,
+                 width: float,
+                 grid_shape: Tuple[int, ...],
+                 dx: float = 1.0) -> np.ndarray:
+    """
+    Superposition sum_p A_p exp(-|x - c_p dx|² / 2w²) of many Gaussians.
+
+    Each Gaussian is separable, so the sum is a contraction of per-axis factor
+    matrices F_i[p, x_i] over the particle index. In 2D this is a single
+    matrix product F_0^T diag(A) F_1 and runs through BLAS.
+
+    Args:
+        centers: Center coordinates, shape (n, ndim) (in grid units)
+        amplitudes: Peak amplitudes, scalar or shape (n,)
+        width: Common Gaussian width (sigma)
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+
+    Returns:
+        Summed field
+    """
+    centers = np.atleast_2d(np.asarray(centers, dtype=np.float64))
+    amplitudes = np.broadcast_to(np.asarray(amplitudes, dtype=np.float64),
+                                 (centers.shape[0],))
+    axes = coordinate_axes(tuple(grid_shape), dx)
+
+    # F_i[p, x_i]: one row per particle
+    factors = [np.exp(-(x[None, :] - centers[:, [i]] * dx)**2
+                      / (2 * width**2))
+               for i, x in enumerate(axes)]
+    factors[0] = amplitudes[:, None] * factors[0]
+
+    if len(factors) == 1:
+        return factors[0].sum(axis=0)
+    if len(factors) == 2:
+        return factors[0].T @ factors[1]
+
+    letters = 'abcdefghijklmnopqrstuvwxyz'[:len(factors)]
+    subscripts = ','.join('p' + c for c in letters) + '->' + letters
+    return np.einsum(subscripts, *factors, optimize=True)
+
+
+def plane_wave_sum(wavevectors: Sequence[Tuple[float, ...]],
+                   grid_shape: Tuple[int, ...],
+                   dx: float = 1.0,
+                   phase: float = 0.0) -> np.ndarray:
+    """
+    Sum of plane waves sum_j cos(k_j · x + phase).
+
+    Uses cos(k·x + φ) = Re[e^{iφ} prod_i e^{i k_i x_i}], so each wave is an
+    outer product of 1D complex exponentials instead of a full-grid cosine.
+
+    Args:
+        wavevectors: Wavevectors k_j, each of length ndim
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+        phase: Common phase offset
+
+    Returns:
+        Summed field
+    """
+    axes = coordinate_axes(tuple(grid_shape), dx)
+    pattern = np.zeros(tuple(grid_shape))
+    for k in wavevectors:
+        factors = [np.exp(1j * k_i * x) for k_i, x in zip(k, axes)]
+        factors[0] = factors[0] * np.exp(1j * phase)
+        pattern += outer_product(factors).real
+    return pattern
+
+
+def hex_lattice(amplitude: float,
+                wavelength: float,
+                grid_shape: Tuple[int, int],
+                dx: float = 1.0,
+                phase: float = 0.0) -> np.ndarray:
+    """Hexagonal lattice: three plane waves at 120°, normalized by 3."""
+    if len(grid_shape) != 2:
+        raise ValueError("Hexagonal pattern only for 2D grids")
+
+    k = 2 * np.pi / wavelength
+    s = np.sqrt(3) / 2
+    wavevectors = [(k, 0.0), (0.5 * k, -s * k), (0.5 * k, s * k)]
+    return amplitude * plane_wave_sum(wavevectors, grid_shape, dx, phase) / 3.0
+
+
+def pentagonal_lattice(amplitude: float,
+                       wavelength: float,
+                       grid_shape: Tuple[int, int],
+                       dx: float = 1.0,
+                       phase: float = 0.0) -> np.ndarray:
+    """Pentagonal approximation: five plane waves at 72°, normalized by 5."""
+    if len(grid_shape) != 2:
+        raise ValueError("Pentagonal pattern only for 2D grids")
+
+    k = 2 * np.pi / wavelength
+    angles = 2 * np.pi * np.arange(5) / 5
+    wavevectors = [(k * np.cos(a), k * np.sin(a)) for a in angles]
+    return amplitude * plane_wave_sum(wavevectors, grid_shape, dx, phase) / 5.0
+
+
+def square_lattice(amplitude: float,
+                   wavelength: float,
+                   grid_shape: Tuple[int, int],
+                   dx: float = 1.0,
+                   phase: float = 0.0) -> np.ndarray:
+    """Square lattice: two orthogonal plane waves, normalized by 2."""
+    if len(grid_shape) != 2:
+        raise ValueError("Square pattern only for 2D grids")
+
+    k = 2 * np.pi / wavelength
+    wavevectors = [(k, 0.0), (0.0, k)]
+    return amplitude * plane_wave_sum(wavevectors, grid_shape, dx, phase) / 2.0
+
+
+def gaussian_transfer(grid_shape: Tuple[int, ...],
+                      sigma: float,
+                      dx: float = 1.0) -> np.ndarray:
+    """
+    Half-spectrum transfer function of a periodic Gaussian smoothing filter.
+
+    Multiplying rfftn(field) by this array and transforming back is the
+    periodic equivalent of ndimage.gaussian_filter(field, sigma / dx).
+
+    Args:
+        grid_shape: Shape of spatial grid
+        sigma: Filter width (physical units)
+        dx: Grid spacing
+
+    Returns:
+        exp(-k²σ²/2) on the rfftn half-spectrum grid
+    """
+    k_axes = [2 * np.pi * np.fft.fftfreq(N, d=dx) for N in grid_shape[:-1]]
+    k_axes.append(2 * np.pi * np.fft.rfftfreq(grid_shape[-1], d=dx))
+    factors = [np.exp(-0.5 * (k * sigma)**2) for k in k_axes]
+    return outer_product(factors)
+
+
+def spectral_gaussian_kernel(grid_shape: Tuple[int, ...],
+                             width: float,
+                             dx: float = 1.0,
+                             deconvolve_cic: bool = True) -> np.ndarray:
+    """
+    Half-spectrum multiplier turning deposited point weights into Gaussians.
+
+    Convolving grid weights with a peak-normalized Gaussian exp(-r²/2w²) is a
+    multiplication by (2πw²)^(d/2)/dx^d exp(-k²w²/2) in Fourier space. With
+    deconvolve_cic the cloud-in-cell window sinc²(k dx/2) of the deposit is
+    divided out, so the result matches exact Gaussians centered off-grid.
+
+    Args:
+        grid_shape: Shape of spatial grid
+        width: Gaussian width (sigma, physical units)
+        dx: Grid spacing
+        deconvolve_cic: Divide out the cloud-in-cell assignment window
+
+    Returns:
+        Multiplier on the rfftn half-spectrum grid
+    """
+    ndim = len(grid_shape)
+    k_axes = [2 * np.pi * np.fft.fftfreq(N, d=dx) for N in grid_shape[:-1]]
+    k_axes.append(2 * np.pi * np.fft.rfftfreq(grid_shape[-1], d=dx))
+
+    factors = []
+    for k in k_axes:
+        factor = np.exp(-0.5 * (k * width)**2)
+        if deconvolve_cic:
+            factor = factor / np.sinc(k * dx / (2 * np.pi))**2
+        factors.append(factor)
+    factors[0] = factors[0] * (2 * np.pi * width**2)**(ndim / 2) / dx**ndim
+    return outer_product(factors)
+
+
+# ============================================================================
+# Memoized Pattern Registry
+# ============================================================================
+
+def _freeze(value):
+    """Turn list/array parameters into hashable tuples for cache keys."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ImprintLibrary:
+    """
+    LRU-memoized registry of static imprint patterns.
+
+    Patterns are built on first request by a registered builder and cached
+    under (name, parameters, dtype). Cached arrays are returned read-only;
+    call .copy() before modifying one in place.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        """
+        Initialize an empty library with the standard builders registered.
+
+        Args:
+            maxsize: Maximum number of cached patterns (least recently used
+                     patterns are evicted first)
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._builders: Dict[str, Callable[..., np.ndarray]] = {}
+        self._cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+
+        self.register('gaussian', gaussian)
+        self.register('hex_lattice', hex_lattice)
+        self.register('hexagonal', hex_lattice)
+        self.register('pentagonal', pentagonal_lattice)
+        self.register('square', square_lattice)
+        self.register('gaussian_transfer', gaussian_transfer)
+        self.register('spectral_gaussian_kernel', spectral_gaussian_kernel)
+
+    def register(self, name: str, builder: Callable[..., np.ndarray]):
+        """
+        Register a pattern builder under a name.
+
+        Args:
+            name: Pattern name passed to get()
+            builder: Callable taking keyword parameters and returning an array;
+                     must be deterministic in its parameters
+        """
+        self._builders[name] = builder
+        # Drop anything cached under a builder that has been replaced
+        for key in [key for key in self._cache if key[0] == name]:
+            del self._cache[key]
+
+    @property
+    def names(self) -> list:
+        """Registered pattern names."""
+        return list(self._builders)
+
+    def get(self, name: str, dtype=np.float64, **params) -> np.ndarray:
+        """
+        Look up a pattern, building and caching it on a miss.
+
+        Args:
+            name: Registered pattern name
+            dtype: Precision of the returned pattern (built in float64)
+            **params: Builder parameters
+
+        Returns:
+            Read-only cached pattern
+        """
+        if name not in self._builders:
+            raise KeyError(f"Unknown imprint pattern '{name}'. "
+                           f"Registered: {', '.join(self._builders)}")
+
+        dtype = np.dtype(dtype)
+        key = (name, dtype.str,
+               tuple(sorted((k, _freeze(v)) for k, v in params.items())))
+
+        pattern = self._cache.get(key)
+        if pattern is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return pattern
+
+        self.misses += 1
+        pattern = np.asarray(self._builders[name](**params))
+        pattern = _read_only(pattern.astype(dtype, copy=False))
+        self._cache[key] = pattern
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return pattern
+
+    def clear(self):
+        """Drop all cached patterns and reset the hit/miss counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# Shared library used by the module-level imprint helpers
+default_library = ImprintLibrary()
+
+
+# ============================================================================
+# Particle-to-Grid Deposition
+# ============================================================================
+
+DEPOSITION_METHODS = ('cic', 'gaussian', 'spectral')
+
+
+class ParticleDeposition:
+    """
+    Particle-to-grid deposition operator for imprint currents.
+
+    Writes J(x) for many particles without building a full-grid field per
+    particle. Positions are in grid units (particle at c sits at x = c*dx),
+    the same convention as create_gaussian_imprint.
+
+    Methods:
+        - 'cic':      cloud-in-cell; each weight is shared linearly between
+                      the 2^d surrounding nodes (sum of J equals sum of
+                      weights). Cost O(n * 2^d)
+        - 'gaussian': truncated Gaussian stencil of half-width
+                      ceil(truncate * width / dx) nodes per axis; each weight
+                      is the peak amplitude, as in create_gaussian_imprint.
+                      Cost O(n * stencil)
+        - 'spectral': cloud-in-cell deposit followed by one FFT convolution
+                      with the Gaussian kernel. Cost O(n * 2^d + N log N),
+                      independent of width; always periodic. Matches exact
+                      Gaussians to about 1% of the peak for width >= 2 dx
+                      (the CIC window is only removed on average)
+    """
+
+    def __init__(self,
+                 grid_shape: Tuple[int, ...],
+                 dx: float = 1.0,
+                 method: str = 'gaussian',
+                 width: float = 3.0,
+                 truncate: float = 4.0,
+                 periodic: bool = True,
+                 fft_backend=None,
+                 dtype=np.float64):
+        """
+        Initialize the deposition operator.
+
+        Args:
+            grid_shape: Shape of spatial grid
+            dx: Grid spacing
+            method: 'cic', 'gaussian' or 'spectral'
+            width: Gaussian width (sigma, physical units); unused for 'cic'
+            truncate: Stencil half-width in units of width ('gaussian')
+            periodic: Wrap stencils around the box; otherwise weight falling
+                      outside the grid is dropped
+            fft_backend: FFT backend name or instance ('spectral')
+            dtype: Precision of the deposited field
+        """
+        if method not in DEPOSITION_METHODS:
+            raise ValueError(f"Unknown deposition method '{method}'. "
+                             f"Choose from {DEPOSITION_METHODS}")
+        if method == 'spectral' and not periodic:
+            raise ValueError("Spectral deposition is always periodic")
+
+        self.grid_shape = tuple(grid_shape)
+        self.ndim = len(self.grid_shape)
+        self.n_points = int(np.prod(self.grid_shape))
+        self.dx = dx
+        self.method = method
+        self.width = width
+        self.truncate = truncate
+        self.periodic = periodic
+        self.dtype = np.dtype(dtype)
+
+        # Row-major strides for flattened node indices
+        self._strides = np.cumprod((1,) + self.grid_shape[:0:-1])[::-1]
+
+        if method == 'gaussian':
+            half = int(np.ceil(truncate * width / dx))
+            self._offsets = np.arange(-half, half + 1)
+        else:
+            self._offsets = np.arange(2)
+
+        if method == 'spectral':
+            self.fft = get_fft_backend(fft_backend)
+            self._kernel = default_library.get(
+                'spectral_gaussian_kernel', grid_shape=self.grid_shape,
+                width=width, dx=dx)
+
+    @property
+    def stencil_size(self) -> int:
+        """Number of nodes touched per particle."""
+        return len(self._offsets)**self.ndim
+
+    def _stencil_weights(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-axis stencil node indices and 1D weights.
+
+        Returns:
+            base: Lowest stencil node per particle and axis, shape (n, ndim)
+            factors: 1D weights per axis, each of shape (n, stencil_width)
+        """
+        if self.method == 'gaussian':
+            base = np.rint(positions).astype(np.intp) + self._offsets[0]
+            nodes = base[:, :, None] + self._offsets[None, None, :] - self._offsets[0]
+            distance = (nodes - positions[:, :, None]) * self.dx
+            factors = np.exp(-distance**2 / (2 * self.width**2))
+        else:
+            base = np.floor(positions).astype(np.intp)
+            frac = positions - base
+            factors = np.stack([1.0 - frac, frac], axis=-1)
+        return base, [factors[:, axis] for axis in range(self.ndim)]
+
+    def _scatter(self, positions: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Accumulate stencil weights onto the flattened grid."""
+        n = positions.shape[0]
+        width = len(self._offsets)
+        base, factors = self._stencil_weights(positions)
+
+        flat = np.zeros((n,) + (1,) * self.ndim, dtype=np.intp)
+        stencil = weights.reshape((n,) + (1,) * self.ndim)
+        valid = None
+        for axis, (N, stride) in enumerate(zip(self.grid_shape, self._strides)):
+            shape = [n] + [1] * self.ndim
+            shape[axis + 1] = width
+            nodes = base[:, [axis]] + np.arange(width)
+            if self.periodic:
+                nodes = nodes % N
+            else:
+                inside = (nodes >= 0) & (nodes < N)
+                inside = inside.reshape(shape)
+                valid = inside if valid is None else valid & inside
+                nodes = np.clip(nodes, 0, N - 1)
+            flat = flat + (nodes * stride).reshape(shape)
+            stencil = stencil * factors[axis].reshape(shape)
+
+        if valid is not None:
+            stencil = np.where(valid, stencil, 0.0)
+        flat, stencil = np.broadcast_arrays(flat, stencil)
+        density = np.bincount(flat.ravel(), weights=stencil.ravel(),
+                              minlength=self.n_points)
+        return density.reshape(self.grid_shape)
+
+    def deposit(self,
+                positions: np.ndarray,
+                weights: Union[float, np.ndarray] = 1.0,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Deposit weighted particles onto the grid.
+
+        Args:
+            positions: Particle positions in grid units, shape (n, ndim)
+            weights: Per-particle weights (amplitudes, signed charges),
+                     scalar or shape (n,)
+            out: Optional array receiving the field
+
+        Returns:
+            Deposited field of shape grid_shape
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, self.ndim)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64),
+                                  (positions.shape[0],))
+
+        if positions.shape[0] == 0:
+            field = np.zeros(self.grid_shape)
+        else:
+            field = self._scatter(positions, weights)
+
+        if self.method == 'spectral':
+            field_hat = self.fft.rfftn(field)
+            field_hat *= self._kernel
+            field = self.fft.irfftn(field_hat, s=self.grid_shape)
+
+        if out is None:
+            return field.astype(self.dtype, copy=False)
+        out[...] = field
+        return out
+
+    def interpolate(self, field: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """
+        Sample a grid field at particle positions (cloud-in-cell gather).
+
+        Multilinear interpolation from the 2^d surrounding nodes regardless
+        of the deposition method, i.e. the adjoint of the 'cic' deposit.
+
+        Args:
+            field: Field of shape grid_shape, or (n_components,) + grid_shape
+                   to sample several components (e.g. a gradient) at once
+            positions: Particle positions in grid units, shape (n, ndim)
+
+        Returns:
+            Samples of shape (n,) or (n, n_components)
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, self.ndim)
+        field = np.asarray(field)
+        leading = field.shape[:field.ndim - self.ndim]
+        if field.shape[field.ndim - self.ndim:] != self.grid_shape:
+            raise ValueError(f"Field shape {field.shape} does not end in "
+                             f"grid shape {self.grid_shape}")
+
+        base = np.floor(positions).astype(np.intp)
+        frac = positions - base
+        values = np.zeros(leading + (positions.shape[0],))
+        for corner in np.ndindex(*(2,) * self.ndim):
+            weight = np.ones(positions.shape[0])
+            index = []
+            for axis, (offset, N) in enumerate(zip(corner, self.grid_shape)):
+                weight *= frac[:, axis] if offset else 1.0 - frac[:, axis]
+                nodes = base[:, axis] + offset
+                index.append(nodes % N if self.periodic else np.clip(nodes, 0, N - 1))
+            values += weight * field[(Ellipsis,) + tuple(index)]
+        return np.moveaxis(values, -1, 0) if leading else values
+
+
+def deposit_particles(positions: np.ndarray,
+                      weights: Union[float, np.ndarray],
+                      grid_shape: Tuple[int, ...],
+                      dx: float = 1.0,
+                      method: str = 'gaussian',
+                      width: float = 3.0,
+                      **kwargs) -> np.ndarray:
+    """
+    One-shot particle-to-grid deposition (see ParticleDeposition).
+
+    Args:
+        positions: Particle positions in grid units, shape (n, ndim)
+        weights: Per-particle weights, scalar or shape (n,)
+        grid_shape: Shape of spatial grid
+        dx: Grid spacing
+        method: 'cic', 'gaussian' or 'spectral'
+        width: Gaussian width (sigma, physical units)
+        **kwargs: Passed to ParticleDeposition
+
+    Returns:
+        Deposited field
+    """
+    return ParticleDeposition(grid_shape, dx, method, width,
+                              **kwargs).deposit(positions, weights)
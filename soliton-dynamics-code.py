@@ -27,11 +27,32 @@ License: MIT
 
 import numpy as np
 from scipy.spatial import cKDTree
-from typing import Tuple, Optional, List, Callable
+from typing import Tuple, Optional, List, Callable, Dict, Union, Sequence
 from dataclasses import dataclass
 from enum import Enum
+import time
 import warnings
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _rowdot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Row-wise dot product over the last axis.
+    
+    Stacked matmul goes through the same BLAS dot as np.dot on each row, so
+    vectorized kernels round exactly like the per-primitive reference.
+    """
+    return (a[..., None, :] @ b[..., :, None])[..., 0, 0]
+
+
+def _rownorm(a: np.ndarray) -> np.ndarray:
+    """Row-wise Euclidean norm, bit-identical to np.linalg.norm on each row."""
+    return np.sqrt(_rowdot(a, a))
+
 
 class PrimitiveType(Enum):
     """Types of primitives."""
@@ -51,6 +72,13 @@ class SolitonParameters:
         dt: Time step (should be << r_ann/c)
         interaction_cutoff: Maximum interaction distance (for efficiency)
         enable_annihilation: Whether Control-Chaos pairs annihilate
+        neighbor_skin: Verlet skin of the force neighbor list; the list is
+            rebuilt once a primitive has moved more than half of it
+        compact_fraction: Annihilated primitives are dropped from the particle
+            arrays once they make up this fraction of the stored rows
+            (values above 1 disable compaction)
+        tree_theta: Barnes-Hut opening angle of the 'tree' force kernel
+        tree_leaf_size: Maximum number of primitives in a tree leaf
     """
     c: float = 1.0
     G: float = 0.1
@@ -58,6 +86,10 @@ class SolitonParameters:
     dt: float = 0.01
     interaction_cutoff: float = 10.0
     enable_annihilation: bool = True
+    neighbor_skin: float = 0.5
+    compact_fraction: float = 0.5
+    tree_theta: float = 0.5
+    tree_leaf_size: int = 8
 
 
 class Primitive:
@@ -68,13 +100,21 @@ class Primitive:
         - Always moves at speed c
         - Has type (Control or Chaos)
         - Interacts via perpendicular inverse-square force
+    
+    A Primitive is a lightweight view of one row of a structure-of-arrays
+    store (a SolitonSimulator, or a private one-row store for a primitive
+    built on its own). Reading or assigning position, velocity, ptype, pid
+    and active goes straight to the underlying arrays.
     """
     
+    __slots__ = ('_store', '_index')
+    
     def __init__(self, 
                  position: np.ndarray,
                  velocity: np.ndarray,
                  ptype: PrimitiveType,
-                 pid: int = 0):
+                 pid: int = 0,
+                 rng: Optional[np.random.Generator] = None):
         """
         Initialize primitive.
         
@@ -83,31 +123,84 @@ class Primitive:
             velocity: 2D or 3D velocity vector (will be normalized to c)
             ptype: Primitive type (CONTROL or CHAOS)
             pid: Unique identifier
+            rng: Generator used to draw a direction for a zero velocity
+                (fresh OS entropy if None)
         """
-        self.position = np.array(position, dtype=float)
-        self.ptype = ptype
-        self.pid = pid
+        position = np.array(position, dtype=float)
+        velocity = np.asarray(velocity, dtype=float)
         
         # Normalize velocity to c
         v_norm = np.linalg.norm(velocity)
         if v_norm > 0:
-            self.velocity = velocity * (1.0 / v_norm)  # Unit vector
+            velocity = velocity * (1.0 / v_norm)  # Unit vector
         else:
             # Random direction if zero velocity given
+            rng = rng if rng is not None else np.random.default_rng()
             if len(position) == 2:
-                angle = np.random.rand() * 2 * np.pi
-                self.velocity = np.array([np.cos(angle), np.sin(angle)])
+                angle = rng.random() * 2 * np.pi
+                velocity = np.array([np.cos(angle), np.sin(angle)])
             else:
-                self.velocity = self._random_unit_vector_3d()
+                velocity = self._random_unit_vector_3d(rng)
         
-        self.active = True
+        self._store = _PrimitiveArrays(position[None, :], velocity[None, :],
+                                       [ptype.value], [pid])
+        self._index = 0
+    
+    @classmethod
+    def _view(cls, store, index: int) -> 'Primitive':
+        """View of row `index` of a structure-of-arrays store."""
+        primitive = cls.__new__(cls)
+        primitive._store = store
+        primitive._index = index
+        return primitive
+    
+    @property
+    def position(self) -> np.ndarray:
+        return self._store.positions[self._index]
+    
+    @position.setter
+    def position(self, value: np.ndarray):
+        self._store.positions[self._index] = value
+    
+    @property
+    def velocity(self) -> np.ndarray:
+        return self._store.velocities[self._index]
+    
+    @velocity.setter
+    def velocity(self, value: np.ndarray):
+        self._store.velocities[self._index] = value
+    
+    @property
+    def ptype(self) -> PrimitiveType:
+        return PrimitiveType(int(self._store.type_sign[self._index]))
+    
+    @ptype.setter
+    def ptype(self, value: PrimitiveType):
+        self._store.type_sign[self._index] = value.value
+    
+    @property
+    def pid(self) -> int:
+        return int(self._store.pid[self._index])
+    
+    @pid.setter
+    def pid(self, value: int):
+        self._store.pid[self._index] = value
+    
+    @property
+    def active(self) -> bool:
+        return bool(self._store.active[self._index])
+    
+    @active.setter
+    def active(self, value: bool):
+        self._store.active[self._index] = value
     
     @staticmethod
-    def _random_unit_vector_3d() -> np.ndarray:
+    def _random_unit_vector_3d(rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """Generate random unit vector in 3D."""
+        rng = rng if rng is not None else np.random.default_rng()
         # Marsaglia method
         while True:
-            x = np.random.randn(3)
+            x = rng.standard_normal(3)
             norm = np.linalg.norm(x)
             if norm > 0.1:
                 return x / norm
@@ -115,19 +208,704 @@ class Primitive:
     @property
     def type_sign(self) -> int:
         """Return +1 for Control, -1 for Chaos."""
-        return self.ptype.value
+        return int(self._store.type_sign[self._index])
+
+
+class _PrimitiveArrays:
+    """
+    Structure-of-arrays primitive state.
+    
+    Attributes:
+        positions: Positions, shape (N, d)
+        velocities: Unit velocities, shape (N, d)
+        type_sign: Type signs σ (+1 Control, -1 Chaos), shape (N,)
+        active: False once a primitive has annihilated, shape (N,)
+        pid: Unique identifiers, shape (N,)
+    """
+    
+    def __init__(self, positions, velocities, type_sign, pid, active=None):
+        self.positions = np.array(positions, dtype=float)
+        self.velocities = np.array(velocities, dtype=float)
+        self.type_sign = np.array(type_sign, dtype=np.int8)
+        self.pid = np.array(pid, dtype=np.int64)
+        if active is None:
+            active = np.ones(len(self.pid), dtype=bool)
+        self.active = np.array(active, dtype=bool)
+
+
+FORCE_KERNELS = ('numpy', 'numba', 'tree')
+
+
+if numba is not None:
+    # Not cached: the on-disk cache is keyed to the importing module name,
+    # which differs between running this script and loading it as a sibling
+    @numba.njit(parallel=True)
+    def _numba_forces(positions, velocities, sign, rows, indptr, indices,
+                      all_pairs, box, cutoff, G, F):
+        """
+        Perpendicular forces over a CSR neighbor list, one thread per row.
+        
+        With all_pairs, every row runs over all of indices instead of its
+        indptr slice. Same skips as the scalar reference.
+        """
+        d = positions.shape[1]
+        for n in numba.prange(rows.size):
+            i = rows[n]
+            start, stop = (0, indices.size) if all_pairs else (indptr[n], indptr[n + 1])
+            f0 = f1 = f2 = 0.0
+            v0 = velocities[i, 0]
+            v1 = velocities[i, 1]
+            v2 = velocities[i, 2] if d == 3 else 0.0
+            for k in range(start, stop):
+                j = indices[k]
+                if j == i:
+                    continue
+                
+                # Separation vector (minimum image)
+                r0 = positions[j, 0] - positions[i, 0]
+                r1 = positions[j, 1] - positions[i, 1]
+                r2 = positions[j, 2] - positions[i, 2] if d == 3 else 0.0
+                r0 -= box * np.round(r0 / box)
+                r1 -= box * np.round(r1 / box)
+                r2 -= box * np.round(r2 / box)
+                
+                r_norm = np.sqrt(r0 * r0 + r1 * r1 + r2 * r2)
+                if r_norm > cutoff or r_norm < 0.01:
+                    continue
+                
+                # Perpendicular component to i's velocity
+                rv = r0 * v0 + r1 * v1 + r2 * v2
+                p0 = r0 - rv * v0
+                p1 = r1 - rv * v1
+                p2 = r2 - rv * v2
+                
+                p_norm = np.sqrt(p0 * p0 + p1 * p1 + p2 * p2)
+                if p_norm < 0.01:
+                    continue
+                
+                F_mag = G * sign[i] * sign[j] / (p_norm * p_norm)
+                f0 += F_mag * p0 / p_norm
+                f1 += F_mag * p1 / p_norm
+                f2 += F_mag * p2 / p_norm
+            F[i, 0] = f0
+            F[i, 1] = f1
+            if d == 3:
+                F[i, 2] = f2
+    
+    @numba.njit(parallel=True)
+    def _numba_tree_forces(positions, velocities, sign, targets, index, start,
+                           count, size, center, child_start, child_end,
+                           q_control, x_control, q_chaos, x_chaos,
+                           box, cutoff, G, theta, F):
+        """
+        Barnes-Hut walk of a ForceTree, one thread per target with an
+        explicit stack. Same opening test and leaf sums as ForceTree.walk.
+        """
+        d = positions.shape[1]
+        root_d = np.sqrt(d)
+        for n in numba.prange(targets.size):
+            i = targets[n]
+            f0 = f1 = f2 = 0.0
+            x0 = positions[i, 0]
+            x1 = positions[i, 1]
+            x2 = positions[i, 2] if d == 3 else 0.0
+            v0 = velocities[i, 0]
+            v1 = velocities[i, 1]
+            v2 = velocities[i, 2] if d == 3 else 0.0
+            
+            stack = np.empty(256, dtype=np.intp)
+            stack[0] = 0
+            top = 1
+            while top > 0:
+                top -= 1
+                node = stack[top]
+                half = 0.5 * size[node]
+                
+                # Cell centre (minimum image) and its nearest / farthest extent
+                c0 = center[node, 0] - x0
+                c1 = center[node, 1] - x1
+                c2 = center[node, 2] - x2 if d == 3 else 0.0
+                c0 -= box * np.round(c0 / box)
+                c1 -= box * np.round(c1 / box)
+                c2 -= box * np.round(c2 / box)
+                e0, e1, e2 = abs(c0), abs(c1), abs(c2)
+                whole = (e0 + half <= 0.5 * box and e1 + half <= 0.5 * box and
+                         (d == 2 or e2 + half <= 0.5 * box))
+                g0 = max(e0 - half, 0.0)
+                g1 = max(e1 - half, 0.0)
+                g2 = max(e2 - half, 0.0) if d == 3 else 0.0
+                if np.sqrt(g0 * g0 + g1 * g1 + g2 * g2) > cutoff:
+                    continue
+                a0, a1 = e0 + half, e1 + half
+                a2 = e2 + half if d == 3 else 0.0
+                reach = np.sqrt(a0 * a0 + a1 * a1 + a2 * a2)
+                
+                cv = c0 * v0 + c1 * v1 + c2 * v2
+                p0 = c0 - cv * v0
+                p1 = c1 - cv * v1
+                p2 = c2 - cv * v2
+                r_perp = np.sqrt(p0 * p0 + p1 * p1 + p2 * p2)
+                
+                if (whole and reach <= cutoff and size[node] < theta * r_perp and
+                        r_perp - half * root_d >= 0.01):
+                    # One monopole per charge species
+                    for species in range(2):
+                        q = q_control[node] if species == 0 else q_chaos[node]
+                        if q == 0.0:
+                            continue
+                        xq = x_control if species == 0 else x_chaos
+                        r0 = c0 + xq[node, 0] - center[node, 0]
+                        r1 = c1 + xq[node, 1] - center[node, 1]
+                        r2 = c2 + xq[node, 2] - center[node, 2] if d == 3 else 0.0
+                        rv = r0 * v0 + r1 * v1 + r2 * v2
+                        p0 = r0 - rv * v0
+                        p1 = r1 - rv * v1
+                        p2 = r2 - rv * v2
+                        p_norm = np.sqrt(p0 * p0 + p1 * p1 + p2 * p2)
+                        F_mag = G * sign[i] * q / (p_norm * p_norm)
+                        f0 += F_mag * p0 / p_norm
+                        f1 += F_mag * p1 / p_norm
+                        f2 += F_mag * p2 / p_norm
+                    continue
+                
+                if child_start[node] < child_end[node]:
+                    for child in range(child_start[node], child_end[node]):
+                        stack[top] = child
+                        top += 1
+                    continue
+                
+                # Leaf: direct sum with the scalar reference's skips
+                for k in range(start[node], start[node] + count[node]):
+                    j = index[k]
+                    if j == i:
+                        continue
+                    r0 = positions[j, 0] - x0
+                    r1 = positions[j, 1] - x1
+                    r2 = positions[j, 2] - x2 if d == 3 else 0.0
+                    r0 -= box * np.round(r0 / box)
+                    r1 -= box * np.round(r1 / box)
+                    r2 -= box * np.round(r2 / box)
+                    
+                    r_norm = np.sqrt(r0 * r0 + r1 * r1 + r2 * r2)
+                    if r_norm > cutoff or r_norm < 0.01:
+                        continue
+                    rv = r0 * v0 + r1 * v1 + r2 * v2
+                    p0 = r0 - rv * v0
+                    p1 = r1 - rv * v1
+                    p2 = r2 - rv * v2
+                    p_norm = np.sqrt(p0 * p0 + p1 * p1 + p2 * p2)
+                    if p_norm < 0.01:
+                        continue
+                    F_mag = G * sign[i] * sign[j] / (p_norm * p_norm)
+                    f0 += F_mag * p0 / p_norm
+                    f1 += F_mag * p1 / p_norm
+                    f2 += F_mag * p2 / p_norm
+            F[i, 0] = f0
+            F[i, 1] = f1
+            if d == 3:
+                F[i, 2] = f2
+    
+    @numba.njit(parallel=True)
+    def _numba_ensemble_forces(positions, velocities, sign, active, box,
+                               cutoff, G, F):
+        """
+        All-pairs perpendicular forces of a padded ensemble, one thread per
+        (replica, primitive). Same skips as the scalar reference.
+        """
+        R, n, d = positions.shape
+        for k in numba.prange(R * n):
+            b = k // n
+            i = k % n
+            if not active[b, i]:
+                continue
+            f0 = f1 = f2 = 0.0
+            v0 = velocities[b, i, 0]
+            v1 = velocities[b, i, 1]
+            v2 = velocities[b, i, 2] if d == 3 else 0.0
+            for j in range(n):
+                if j == i or not active[b, j]:
+                    continue
+                
+                # Separation vector (minimum image)
+                r0 = positions[b, j, 0] - positions[b, i, 0]
+                r1 = positions[b, j, 1] - positions[b, i, 1]
+                r2 = positions[b, j, 2] - positions[b, i, 2] if d == 3 else 0.0
+                r0 -= box * np.round(r0 / box)
+                r1 -= box * np.round(r1 / box)
+                r2 -= box * np.round(r2 / box)
+                
+                r_norm = np.sqrt(r0 * r0 + r1 * r1 + r2 * r2)
+                if r_norm > cutoff[b] or r_norm < 0.01:
+                    continue
+                
+                # Perpendicular component to i's velocity
+                rv = r0 * v0 + r1 * v1 + r2 * v2
+                p0 = r0 - rv * v0
+                p1 = r1 - rv * v1
+                p2 = r2 - rv * v2
+                
+                p_norm = np.sqrt(p0 * p0 + p1 * p1 + p2 * p2)
+                if p_norm < 0.01:
+                    continue
+                
+                F_mag = G[b] * sign[b, i] * sign[b, j] / (p_norm * p_norm)
+                f0 += F_mag * p0 / p_norm
+                f1 += F_mag * p1 / p_norm
+                f2 += F_mag * p2 / p_norm
+            F[b, i, 0] = f0
+            F[b, i, 1] = f1
+            if d == 3:
+                F[b, i, 2] = f2
+    
+    @numba.njit(parallel=True)
+    def _numba_ensemble_annihilation(positions, sign, active, box, r_ann, partner):
+        """
+        Greedy Control-Chaos matching in (i, j) order, one thread per
+        replica. Sets partner[b, i] = j (and partner[b, j] = i) for every
+        annihilated pair.
+        """
+        R, n, d = positions.shape
+        for b in numba.prange(R):
+            for i in range(n):
+                if not active[b, i] or partner[b, i] >= 0:
+                    continue
+                for j in range(i + 1, n):
+                    if (not active[b, j] or partner[b, j] >= 0 or
+                            sign[b, i] == sign[b, j]):
+                        continue
+                    r2 = 0.0
+                    for a in range(d):
+                        r = positions[b, j, a] - positions[b, i, a]
+                        r -= box * np.round(r / box)
+                        r2 += r * r
+                    if np.sqrt(r2) < r_ann[b]:
+                        partner[b, i] = j
+                        partner[b, j] = i
+                        break
+
+
+def _resolve_force_kernel(kernel: str) -> str:
+    """Map 'auto' to the fastest available kernel and validate the name."""
+    if kernel == 'auto':
+        return 'numba' if numba is not None else 'numpy'
+    if kernel not in FORCE_KERNELS:
+        raise ValueError(f"Unknown force kernel: {kernel}")
+    if kernel == 'numba' and numba is None:
+        raise ImportError("numba is required for the 'numba' force kernel")
+    return kernel
+
+
+def _periodic_pairs(positions: np.ndarray, index: np.ndarray,
+                    box_size: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs (i < j) of the listed primitives within radius, via a periodic
+    cKDTree (boxsize=box_size).
+    
+    Args:
+        positions: Positions of all primitives, shape (N, d)
+        index: Ascending indices of the primitives to search
+        box_size: Size of periodic simulation box
+        radius: Search radius (inclusive)
+        
+    Returns:
+        i, j: Index arrays with i < j (unordered)
+    """
+    if len(index) < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    
+    # cKDTree needs coordinates in [0, box_size)
+    points = positions[index] % box_size
+    points[points >= box_size] = 0.0
+    tree = cKDTree(points, boxsize=box_size)
+    pairs = tree.query_pairs(radius, output_type='ndarray')
+    return index[pairs[:, 0]], index[pairs[:, 1]]
+
+
+class NeighborList:
+    """
+    Verlet neighbor list for a periodic box.
+    
+    Candidate pairs within cutoff + skin are found with a periodic cKDTree
+    (boxsize=box_size). The list stays valid until some primitive has moved
+    more than skin/2 since the last build, so it is rebuilt only every
+    ~skin / (2 c dt) steps; the exact cutoff is applied by the force kernel.
+    """
+    
+    def __init__(self, box_size: float, skin: float):
+        """
+        Initialize an empty neighbor list.
+        
+        Args:
+            box_size: Size of periodic simulation box
+            skin: Extra search radius beyond the interaction cutoff
+        """
+        self.box_size = box_size
+        self.skin = skin
+        self.n_builds = 0
+        self.invalidate()
+    
+    def invalidate(self):
+        """Force a rebuild on the next update (e.g. after arrays change)."""
+        self.radius = None
+        self._reference = None
+        self._i = np.empty(0, dtype=np.intp)
+        self._j = np.empty(0, dtype=np.intp)
+    
+    def needs_rebuild(self, positions: np.ndarray, cutoff: float) -> bool:
+        """Whether any primitive moved more than skin/2 since the last build."""
+        if self._reference is None or self.radius != cutoff + self.skin:
+            return True
+        if self._reference.shape != positions.shape:
+            return True
+        moved = positions - self._reference
+        moved -= self.box_size * np.round(moved / self.box_size)
+        return np.max(np.sum(moved**2, axis=1), initial=0.0) > (0.5 * self.skin)**2
+    
+    def build(self, positions: np.ndarray, active: np.ndarray, cutoff: float):
+        """
+        Rebuild the candidate pair list from the current positions.
+        
+        Args:
+            positions: Positions of all primitives, shape (N, d)
+            active: Mask of primitives to include
+            cutoff: Interaction cutoff (the search radius is cutoff + skin)
+        """
+        self.radius = cutoff + self.skin
+        self._reference = positions.copy()
+        self.n_builds += 1
+        
+        a, b = _periodic_pairs(positions, np.flatnonzero(active),
+                               self.box_size, self.radius)
+        
+        # Directed pairs (i, j) and (j, i), sorted by i then j so per-primitive
+        # sums accumulate in the same order as a loop over all j
+        i = np.concatenate([a, b])
+        j = np.concatenate([b, a])
+        order = np.lexsort((j, i))
+        self._i, self._j = i[order], j[order]
+    
+    def update(self, positions: np.ndarray, active: np.ndarray,
+               cutoff: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return directed candidate pairs among active primitives.
+        
+        Rebuilds the list first if it is stale. Primitives deactivated since
+        the last build are filtered out without a rebuild.
+        
+        Args:
+            positions: Positions of all primitives, shape (N, d)
+            active: Mask of active primitives
+            cutoff: Interaction cutoff
+            
+        Returns:
+            i, j: Index arrays of directed pairs, sorted by (i, j)
+        """
+        if self.needs_rebuild(positions, cutoff):
+            self.build(positions, active, cutoff)
+        
+        keep = active[self._i] & active[self._j]
+        return self._i[keep], self._j[keep]
+    
+    def compact(self, keep: np.ndarray):
+        """
+        Renumber the list after the particle arrays dropped some rows.
+        
+        Pairs touching a dropped row are removed and the rest are mapped to
+        the new row indices, so compaction does not force a rebuild.
+        
+        Args:
+            keep: Mask over the old rows of those that were kept
+        """
+        if self._reference is None:
+            return
+        new_index = np.cumsum(keep) - 1
+        kept = keep[self._i] & keep[self._j]
+        self._i = new_index[self._i[kept]]
+        self._j = new_index[self._j[kept]]
+        self._reference = self._reference[keep]
+
+
+def _morton_codes(cells: np.ndarray, depth: int) -> np.ndarray:
+    """Interleave the bits of integer cell coordinates, shape (N, d)."""
+    d = cells.shape[1]
+    code = np.zeros(len(cells), dtype=np.int64)
+    for bit in range(depth):
+        for axis in range(d):
+            code |= ((cells[:, axis] >> bit) & 1) << (d * bit + axis)
+    return code
+
+
+class ForceTree:
+    """
+    Barnes-Hut tree (quadtree in 2D, octree in 3D) over a periodic box.
+    
+    The charges σ = ±1 are signed, so every cell carries two monopoles: the
+    Control charge at the centroid of its Control primitives and the Chaos
+    charge at the centroid of its Chaos primitives. A cell stands in for its
+    members when, seen from the target primitive i,
+    
+        s < θ |r_perp|
+    
+    where s is the cell side and r_perp the component of the separation to
+    the cell centre perpendicular to v_i. The perpendicular kernel
+    r_perp/|r_perp|³ is singular along the whole line through x_i parallel to
+    v_i, so the opening test uses that distance rather than |r|.
+    
+    Cells are only approximated when they lie entirely within the cutoff and
+    form a single periodic image under the minimum image convention; the
+    rest are opened down to leaves, whose members are summed directly. With
+    θ = 0 every pair is summed directly.
+    """
+    
+    def __init__(self, box_size: float, theta: float = 0.5, leaf_size: int = 8):
+        """
+        Initialize an empty tree.
+        
+        Args:
+            box_size: Size of periodic simulation box
+            theta: Opening angle (0 gives the direct sum)
+            leaf_size: Maximum number of primitives in a leaf cell
+        """
+        self.box_size = box_size
+        self.theta = theta
+        self.leaf_size = leaf_size
+        self.n_nodes = 0
+    
+    def build(self, positions: np.ndarray, type_sign: np.ndarray, active: np.ndarray):
+        """
+        Build the tree over the active primitives.
+        
+        Primitives are sorted along a Morton curve so that every cell holds a
+        contiguous run of them; levels are added until each cell has at most
+        leaf_size members (or the maximum depth is reached).
+        
+        Args:
+            positions: Positions of all primitives, shape (N, d)
+            type_sign: Charges of all primitives, shape (N,)
+            active: Mask of primitives to include
+        """
+        L = self.box_size
+        index = np.flatnonzero(active)
+        d = positions.shape[1]
+        depth = 62 // d
+        
+        points = positions[index] % L
+        points[points >= L] = 0.0
+        cells = np.minimum((points * (2**depth / L)).astype(np.int64), 2**depth - 1)
+        code = _morton_codes(cells, depth)
+        order = np.argsort(code, kind='stable')
+        self.index = index[order]
+        code, cells, points = code[order], cells[order], points[order]
+        
+        # Running sums give the per-cell charges and charge-weighted positions
+        control = type_sign[self.index] > 0
+        cum_control = np.concatenate([[0], np.cumsum(control)])
+        cum_chaos = np.concatenate([[0], np.cumsum(~control)])
+        cum_x_control = np.vstack([np.zeros(d), np.cumsum(points * control[:, None], axis=0)])
+        cum_x_chaos = np.vstack([np.zeros(d), np.cumsum(points * ~control[:, None], axis=0)])
+        
+        starts, counts, sizes, centers, levels = [], [], [], [], []
+        members = np.arange(len(self.index))
+        level = 0
+        while True:
+            keys = code[members] >> (d * (depth - level))
+            _, first, count = np.unique(keys, return_index=True, return_counts=True)
+            start = members[first]
+            size = L / 2**level
+            
+            starts.append(start)
+            counts.append(count)
+            sizes.append(np.full(len(start), size))
+            centers.append(((cells[start] >> (depth - level)) + 0.5) * size)
+            levels.append(keys[first])
+            
+            split = count > self.leaf_size
+            if level == depth or not split.any():
+                break
+            members = members[np.repeat(split, count)]
+            level += 1
+        
+        self.start = np.concatenate(starts)
+        self.count = np.concatenate(counts)
+        self.size = np.concatenate(sizes)
+        self.center = np.concatenate(centers).reshape(-1, d)
+        self.n_nodes = len(self.start)
+        
+        # Children of a cell are the next-level cells whose key begins with its key
+        offsets = np.cumsum([0] + [len(s) for s in starts])
+        self.child_start = np.zeros(self.n_nodes, dtype=np.intp)
+        self.child_end = np.zeros(self.n_nodes, dtype=np.intp)
+        for level in range(len(starts) - 1):
+            parents = slice(offsets[level], offsets[level + 1])
+            keys, child_keys = levels[level], levels[level + 1]
+            self.child_start[parents] = offsets[level + 1] + np.searchsorted(child_keys, keys << d)
+            self.child_end[parents] = offsets[level + 1] + np.searchsorted(child_keys, (keys + 1) << d)
+        self.leaf = self.child_start == self.child_end
+        
+        end = self.start + self.count
+        self.q_control = (cum_control[end] - cum_control[self.start]).astype(float)
+        self.q_chaos = -(cum_chaos[end] - cum_chaos[self.start]).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.x_control = ((cum_x_control[end] - cum_x_control[self.start])
+                              / self.q_control[:, None])
+            self.x_chaos = ((cum_x_chaos[end] - cum_x_chaos[self.start])
+                            / -self.q_chaos[:, None])
+    
+    def walk(self, positions: np.ndarray, velocities: np.ndarray, cutoff: float,
+             targets: Optional[np.ndarray] = None, chunk_size: int = 512):
+        """
+        Traverse the tree for every target primitive, one chunk of targets
+        at a time.
+        
+        All (target, cell) pairs of one tree level are tested at once; opened
+        cells are replaced by their children until every pair has been
+        approximated, pruned (beyond the cutoff) or reached a leaf.
+        
+        Args:
+            positions: Positions of all primitives, shape (N, d)
+            velocities: Unit velocities of all primitives, shape (N, d)
+            cutoff: Interaction cutoff
+            targets: Rows to compute forces on (defaults to the tree's members)
+            chunk_size: Number of targets traversed together
+            
+        Yields:
+            For each chunk, (i, j) directed pairs to sum exactly and (i, r, q)
+            monopole terms: target row, minimum-image displacement to the
+            pseudo-particle and its signed charge
+        """
+        L = self.box_size
+        d = positions.shape[1]
+        if targets is None:
+            targets = self.index
+        
+        for lo in range(0, len(targets) if self.n_nodes else 0, chunk_size):
+            direct_i, direct_j, far_i, far_r, far_q = [], [], [], [], []
+            rows = targets[lo:lo + chunk_size]
+            t = np.arange(len(rows))
+            node = np.zeros(len(rows), dtype=np.intp)
+            x, v = positions[rows], velocities[rows]
+            
+            while len(t):
+                half = 0.5 * self.size[node]
+                dc = self.center[node] - x[t]
+                dc -= L * np.round(dc / L)
+                extent = np.abs(dc)
+                
+                # Cell lies in a single periodic image as seen from the target
+                whole = np.all(extent + half[:, None] <= 0.5 * L, axis=1)
+                gap = np.sqrt(np.sum(np.maximum(extent - half[:, None], 0.0)**2, axis=1))
+                reach = np.sqrt(np.sum((extent + half[:, None])**2, axis=1))
+                
+                v_t = v[t]
+                r_perp = _rownorm(dc - _rowdot(dc, v_t)[:, None] * v_t)
+                pruned = gap > cutoff
+                accept = (whole & (reach <= cutoff) &
+                          (self.size[node] < self.theta * r_perp) &
+                          (r_perp - half * np.sqrt(d) >= 0.01))
+                leaf = ~pruned & ~accept & self.leaf[node]
+                opened = ~pruned & ~accept & ~self.leaf[node]
+                
+                # Monopole terms, one per charge species present in the cell
+                a = node[accept]
+                for q, x_q in ((self.q_control, self.x_control),
+                               (self.q_chaos, self.x_chaos)):
+                    has = q[a] != 0
+                    far_i.append(rows[t[accept][has]])
+                    far_r.append(dc[accept][has] + x_q[a[has]] - self.center[a[has]])
+                    far_q.append(q[a[has]])
+                
+                # Leaf members are summed exactly
+                count = self.count[node[leaf]]
+                first = np.repeat(self.start[node[leaf]] - np.cumsum(count) + count, count)
+                j = self.index[first + np.arange(count.sum())]
+                i = np.repeat(rows[t[leaf]], count)
+                distinct = i != j
+                direct_i.append(i[distinct])
+                direct_j.append(j[distinct])
+                
+                # Replace opened cells by their children
+                n_children = self.child_end[node[opened]] - self.child_start[node[opened]]
+                first = np.repeat(self.child_start[node[opened]] - np.cumsum(n_children)
+                                  + n_children, n_children)
+                node = first + np.arange(n_children.sum())
+                t = np.repeat(t[opened], n_children)
+            
+            yield ((np.concatenate(direct_i), np.concatenate(direct_j)),
+                   (np.concatenate(far_i), np.concatenate(far_r), np.concatenate(far_q)))
+
+
+class _PrimitiveList(list):
+    """
+    List of a SolitonSimulator's Primitive views.
+    
+    Every in-place mutation reloads the simulator's particle arrays from the
+    list, so building sim.primitives with append keeps the two in step. A
+    list the simulator has since replaced (by assignment or compaction)
+    raises instead of silently editing nothing.
+    """
+    
+    def __init__(self, owner: 'SolitonSimulator', primitives=()):
+        super().__init__(primitives)
+        self._owner = owner
+    
+    def _check_current(self):
+        """Raise if the owner no longer holds this list."""
+        if self._owner._views is not self:
+            raise RuntimeError("This primitives list is stale (the simulator was "
+                               "reassigned or compacted); use sim.primitives")
+
+
+def _write_through(name: str):
+    """Wrap a list mutator so it resyncs the owning simulator."""
+    method = getattr(list, name)
+    
+    def mutator(self, *args, **kwargs):
+        self._check_current()
+        result = method(self, *args, **kwargs)
+        self._owner._load_primitives(self)
+        return result
+    
+    mutator.__name__ = name
+    mutator.__doc__ = method.__doc__
+    return mutator
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort',
+              'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_PrimitiveList, _name, _write_through(_name))
 
 
 class SolitonSimulator:
     """
     N-body simulator for primitive dynamics and soliton emergence.
+    
+    Particle state is held as contiguous arrays (positions, velocities,
+    type_sign, active, pid); the primitives list is a set of Primitive views
+    onto those arrays kept for API compatibility, and editing it in place
+    (append, remove, ...) reloads the arrays.
+    
+    Forces are evaluated for all candidate pairs at once: every ordered pair
+    of active primitives when there are at most all_pairs_max of them (or
+    the cutoff spans the whole box), otherwise the Verlet neighbor list.
+    
+    Annihilated primitives are compacted out of the arrays once they make up
+    params.compact_fraction of the rows, so the cost of a step follows the
+    live population. Rows keep their relative order; pid identifies a
+    primitive across compactions (see index_of) and every annihilation is
+    recorded in annihilation_log.
     """
     
+    # Above this many active primitives, candidates come from the neighbor list
+    all_pairs_max = 128
+    
     def __init__(self,
                  n_primitives: int,
                  box_size: float,
                  params: Optional[SolitonParameters] = None,
-                 dimension: int = 2):
+                 dimension: int = 2,
+                 rng: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None,
+                 force_kernel: str = 'numpy'):
         """
         Initialize simulator.
         
@@ -136,39 +914,158 @@ class SolitonSimulator:
             box_size: Size of periodic simulation box
             params: Physical parameters
             dimension: Spatial dimension (2 or 3)
+            rng: Seed, SeedSequence or Generator for the initial conditions
+                (fresh OS entropy if None). Use SeedSequence.spawn to give
+                each run of a parallel sweep its own independent stream.
+            force_kernel: 'numpy' (vectorized over pairs, bit-identical to
+                the scalar per-pair force), 'numba' (parallel compiled loop,
+                identical up to rounding), 'tree' (Barnes-Hut approximation
+                with opening angle params.tree_theta, for large populations
+                whose cutoff prunes little) or 'auto'
         """
         self.n_primitives = n_primitives
         self.box_size = box_size
         self.params = params or SolitonParameters()
         self.dimension = dimension
+        self.rng = np.random.default_rng(rng)
+        self.force_kernel = _resolve_force_kernel(force_kernel)
         
         # Initialize primitives
-        self.primitives: List[Primitive] = []
         self._initialize_primitives()
         
         # Tracking
         self.time = 0.0
         self.step_count = 0
         self.history = []
+        self.annihilation_log = []
+        self.n_compactions = 0
     
     def _initialize_primitives(self):
         """Initialize primitives with random positions and velocities."""
-        for i in range(self.n_primitives):
+        n, d = self.n_primitives, self.dimension
+        positions = np.empty((n, d))
+        velocities = np.empty((n, d))
+        type_sign = np.empty(n, dtype=np.int8)
+        
+        for i in range(n):
             # Random position in box
-            pos = np.random.rand(self.dimension) * self.box_size
+            positions[i] = self.rng.random(d) * self.box_size
             
             # Random velocity direction
-            if self.dimension == 2:
-                angle = np.random.rand() * 2 * np.pi
+            if d == 2:
+                angle = self.rng.random() * 2 * np.pi
                 vel = np.array([np.cos(angle), np.sin(angle)])
             else:
-                vel = Primitive._random_unit_vector_3d()
+                vel = Primitive._random_unit_vector_3d(self.rng)
+            velocities[i] = vel * (1.0 / np.linalg.norm(vel))
             
             # Random type (50/50 Control/Chaos)
-            ptype = PrimitiveType.CONTROL if np.random.rand() > 0.5 else PrimitiveType.CHAOS
+            ptype = PrimitiveType.CONTROL if self.rng.random() > 0.5 else PrimitiveType.CHAOS
+            type_sign[i] = ptype.value
+        
+        self._set_state(positions, velocities, type_sign, np.arange(n))
+    
+    def _set_state(self, positions, velocities, type_sign, pid, active=None):
+        """Replace the particle arrays (and invalidate cached views)."""
+        state = _PrimitiveArrays(positions, velocities, type_sign, pid, active)
+        self.positions = state.positions.reshape(-1, self.dimension)
+        self.velocities = state.velocities.reshape(-1, self.dimension)
+        self.type_sign = state.type_sign
+        self.active = state.active
+        self.pid = state.pid
+        self.n_primitives = len(self.pid)
+        self._views = None
+        self._update_pid_index()
+        self.neighbor_list = NeighborList(self.box_size, self.params.neighbor_skin)
+        self.force_tree = ForceTree(self.box_size, self.params.tree_theta,
+                                    self.params.tree_leaf_size)
+    
+    def _update_pid_index(self):
+        """Rebuild the pid -> row map (-1 for primitives no longer stored)."""
+        size = int(self.pid.max()) + 1 if len(self.pid) else 0
+        self._pid_index = np.full(size, -1, dtype=np.intp)
+        self._pid_index[self.pid] = np.arange(len(self.pid))
+    
+    def index_of(self, pid: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        Current row of the primitive(s) with the given pid.
+        
+        Args:
+            pid: Primitive id or array of ids
             
-            primitive = Primitive(pos, vel, ptype, pid=i)
-            self.primitives.append(primitive)
+        Returns:
+            Row index into the particle arrays, or -1 for primitives that
+            were annihilated and compacted away
+        """
+        pid = np.asarray(pid)
+        in_range = (pid >= 0) & (pid < len(self._pid_index))
+        rows = np.where(in_range, self._pid_index[np.where(in_range, pid, 0)], -1)
+        return int(rows) if rows.ndim == 0 else rows
+    
+    def compact(self):
+        """
+        Drop annihilated primitives from the particle arrays.
+        
+        Active rows keep their relative order, so forces still accumulate in
+        the same order and trajectories are unchanged. Primitive views taken
+        before the call refer to old rows; fetch fresh ones from primitives.
+        """
+        keep = self.active.copy()
+        if keep.all():
+            return
+        self.positions = self.positions[keep]
+        self.velocities = self.velocities[keep]
+        self.type_sign = self.type_sign[keep]
+        self.pid = self.pid[keep]
+        self.active = self.active[keep]
+        self.n_primitives = len(self.pid)
+        self._views = None
+        self._update_pid_index()
+        self.neighbor_list.compact(keep)
+        self.n_compactions += 1
+    
+    def _maybe_compact(self):
+        """Compact once enough stored primitives have annihilated."""
+        n_inactive = len(self.pid) - np.count_nonzero(self.active)
+        if n_inactive and n_inactive >= self.params.compact_fraction * len(self.pid):
+            self.compact()
+    
+    @property
+    def primitives(self) -> List[Primitive]:
+        """
+        Primitive views onto the particle arrays (one per row).
+        
+        The list writes through: append, extend, remove and the other list
+        mutators reload the arrays from its contents.
+        """
+        if self._views is None:
+            self._views = _PrimitiveList(
+                self, [Primitive._view(self, i) for i in range(len(self.pid))])
+        self._check_views()
+        return self._views
+    
+    def _check_views(self):
+        """Raise if the cached primitives list has drifted from the arrays."""
+        if self._views is not None and len(self._views) != len(self.pid):
+            raise RuntimeError("The primitives list no longer matches the particle "
+                               "arrays; assign it with sim.primitives = [...]")
+    
+    @primitives.setter
+    def primitives(self, primitives: List[Primitive]):
+        """Load particle state from Primitive objects (which become views)."""
+        self._load_primitives(_PrimitiveList(self, primitives))
+    
+    def _load_primitives(self, primitives: '_PrimitiveList'):
+        """Replace the particle arrays with the contents of a primitives list."""
+        self._set_state([p.position for p in primitives],
+                        [p.velocity for p in primitives],
+                        [p.type_sign for p in primitives],
+                        [p.pid for p in primitives],
+                        [p.active for p in primitives])
+        for i, p in enumerate(primitives):
+            p._store = self
+            p._index = i
+        self._views = primitives
     
     def _apply_periodic_boundary(self, position: np.ndarray) -> np.ndarray:
         """Apply periodic boundary conditions."""
@@ -186,25 +1083,23 @@ class SolitonSimulator:
         """
         return r - self.box_size * np.round(r / self.box_size)
     
-    def _compute_perpendicular_force(self, 
-                                    pi: Primitive, 
-                                    pj: Primitive) -> np.ndarray:
+    def _compute_perpendicular_force(self, i: int, j: int) -> np.ndarray:
         """
         Compute perpendicular inverse-square force between two primitives.
         
         F_ij = G * σ_i * σ_j * r_perp / |r_perp|³
         
-        where r_perp is the component of separation perpendicular to pi's velocity.
+        where r_perp is the component of separation perpendicular to i's velocity.
         
         Args:
-            pi: First primitive
-            pj: Second primitive
+            i: Index of the first primitive
+            j: Index of the second primitive
             
         Returns:
-            Force vector on pi due to pj
+            Force vector on i due to j
         """
         # Separation vector (minimum image)
-        r = pj.position - pi.position
+        r = self.positions[j] - self.positions[i]
         r = self._minimum_image_separation(r)
         
         r_norm = np.linalg.norm(r)
@@ -213,8 +1108,8 @@ class SolitonSimulator:
         if r_norm > self.params.interaction_cutoff or r_norm < 0.01:
             return np.zeros(self.dimension)
         
-        # Perpendicular component to pi's velocity
-        v_i = pi.velocity
+        # Perpendicular component to i's velocity
+        v_i = self.velocities[i]
         r_parallel = np.dot(r, v_i) * v_i
         r_perp = r - r_parallel
         
@@ -224,8 +1119,8 @@ class SolitonSimulator:
             return np.zeros(self.dimension)
         
         # Force magnitude
-        sigma_i = pi.type_sign
-        sigma_j = pj.type_sign
+        sigma_i = int(self.type_sign[i])
+        sigma_j = int(self.type_sign[j])
         
         F_mag = self.params.G * sigma_i * sigma_j / (r_perp_norm**2)
         
@@ -234,115 +1129,375 @@ class SolitonSimulator:
         
         return F
     
-    def _compute_total_force(self, primitive: Primitive) -> np.ndarray:
+    def _compute_total_force(self, i: int) -> np.ndarray:
         """
         Compute total force on a primitive from all others.
         
         Args:
-            primitive: Primitive to compute force on
+            i: Index of the primitive to compute force on
             
         Returns:
             Total force vector
         """
         F_total = np.zeros(self.dimension)
         
-        for other in self.primitives:
-            if other.pid == primitive.pid or not other.active:
+        for j in np.flatnonzero(self.active):
+            if j == i:
                 continue
             
-            F = self._compute_perpendicular_force(primitive, other)
+            F = self._compute_perpendicular_force(i, j)
             F_total += F
         
         return F_total
     
+    def _all_pairs(self) -> bool:
+        """Whether to skip the neighbor list and take every active pair."""
+        reach = self.params.interaction_cutoff + self.params.neighbor_skin
+        return (np.count_nonzero(self.active) <= self.all_pairs_max or
+                reach >= 0.5 * self.box_size * np.sqrt(self.dimension))
+    
+    def _neighbor_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Directed pairs from the neighbor list, using the current
+        params.neighbor_skin (a changed skin forces a rebuild).
+        """
+        self.neighbor_list.skin = self.params.neighbor_skin
+        return self.neighbor_list.update(self.positions, self.active,
+                                         self.params.interaction_cutoff)
+    
+    def _candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Directed candidate pairs (i, j) among active primitives, sorted by
+        i then j.
+        """
+        if not self._all_pairs():
+            return self._neighbor_pairs()
+        
+        index = np.flatnonzero(self.active)
+        n = len(index)
+        i = np.repeat(index, n)
+        j = np.tile(index, n)
+        distinct = i != j
+        return i[distinct], j[distinct]
+    
+    def _pair_forces(self, i: np.ndarray, j: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Perpendicular inverse-square force on i due to j for many pairs.
+        
+        Vectorized _compute_perpendicular_force with the same operation
+        order, so every pair force is bit-identical to the scalar version.
+        
+        Args:
+            i, j: Index arrays of directed pairs
+            
+        Returns:
+            Mask of interacting pairs and their forces, shape (n_interacting, d)
+        """
+        # Separation vector (minimum image)
+        r = self.positions[j] - self.positions[i]
+        r = self._minimum_image_separation(r)
+        r_norm = _rownorm(r)
+        
+        # Perpendicular component to i's velocity
+        v_i = self.velocities[i]
+        r_perp = r - _rowdot(r, v_i)[:, None] * v_i
+        r_perp_norm = _rownorm(r_perp)
+        
+        # Skip if too far, too close, or (nearly) parallel to v_i
+        interacting = ((r_norm <= self.params.interaction_cutoff) &
+                       (r_norm >= 0.01) & (r_perp_norm >= 0.01))
+        r_perp = r_perp[interacting]
+        r_perp_norm = r_perp_norm[interacting]
+        
+        sigma_i = self.type_sign[i[interacting]].astype(float)
+        sigma_j = self.type_sign[j[interacting]]
+        # float_power rounds like the scalar r_perp_norm**2 (C pow); array
+        # ** 2 would use x*x and differ in the last bit
+        F_mag = self.params.G * sigma_i * sigma_j / np.float_power(r_perp_norm, 2)
+        
+        return interacting, F_mag[:, None] * r_perp / r_perp_norm[:, None]
+    
+    def _compute_forces(self) -> np.ndarray:
+        """
+        Total perpendicular force on every primitive from its neighbors.
+        
+        Pairs beyond the cutoff contribute exactly zero, as in
+        _compute_total_force. With the numpy kernel each primitive's force
+        is accumulated over j in ascending order (bincount sums
+        sequentially), matching the scalar loop bit for bit.
+        
+        Returns:
+            Force array of shape (n_primitives, dimension)
+        """
+        n = len(self.pid)
+        F = np.zeros((n, self.dimension))
+        
+        if self.force_kernel == 'tree':
+            return self._tree_forces()
+        
+        if self.force_kernel == 'numba':
+            args = (self.positions, self.velocities, self.type_sign.astype(float))
+            consts = (float(self.box_size), float(self.params.interaction_cutoff),
+                      float(self.params.G), F)
+            if self._all_pairs():
+                index = np.flatnonzero(self.active)
+                _numba_forces(*args, index, np.zeros(1, dtype=np.intp), index,
+                              True, *consts)
+            else:
+                i, j = self._candidate_pairs()
+                rows, counts = np.unique(i, return_counts=True)
+                indptr = np.concatenate([[0], np.cumsum(counts)])
+                _numba_forces(*args, rows, indptr, j, False, *consts)
+            return F
+        
+        i, j = self._candidate_pairs()
+        interacting, F_pairs = self._pair_forces(i, j)
+        i = i[interacting]
+        for axis in range(self.dimension):
+            F[:, axis] = np.bincount(i, weights=F_pairs[:, axis], minlength=n)
+        return F
+    
+    def _multipole_forces(self, i: np.ndarray, r: np.ndarray,
+                          q: np.ndarray) -> np.ndarray:
+        """
+        Perpendicular force on i due to tree pseudo-particles of charge q at
+        minimum-image displacement r.
+        """
+        v_i = self.velocities[i]
+        r_perp = r - _rowdot(r, v_i)[:, None] * v_i
+        r_perp_norm = _rownorm(r_perp)
+        F_mag = self.params.G * self.type_sign[i] * q / np.float_power(r_perp_norm, 2)
+        return F_mag[:, None] * r_perp / r_perp_norm[:, None]
+    
+    def _tree_forces(self, tree: Optional[ForceTree] = None,
+                     targets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Barnes-Hut approximation of _compute_forces.
+        
+        Runs the compiled walk when numba is available, otherwise the
+        vectorized ForceTree.walk; both apply the same opening test.
+        
+        Args:
+            tree: Tree to use (rebuilt from the current state); defaults to
+                self.force_tree with the current params.tree_theta and
+                params.tree_leaf_size
+            targets: Rows to compute forces on (defaults to all active)
+            
+        Returns:
+            Force array of shape (n_primitives, dimension); rows that are
+            not targets are zero
+        """
+        if tree is None:
+            tree = self.force_tree
+            tree.theta = self.params.tree_theta
+            tree.leaf_size = self.params.tree_leaf_size
+        tree.build(self.positions, self.type_sign, self.active)
+        
+        n = len(self.pid)
+        F = np.zeros((n, self.dimension))
+        if numba is not None and tree.n_nodes:
+            _numba_tree_forces(
+                self.positions, self.velocities, self.type_sign.astype(float),
+                tree.index if targets is None else targets, tree.index,
+                tree.start, tree.count, tree.size, tree.center,
+                tree.child_start, tree.child_end, tree.q_control, tree.x_control,
+                tree.q_chaos, tree.x_chaos, float(self.box_size),
+                float(self.params.interaction_cutoff), float(self.params.G),
+                float(tree.theta), F)
+            return F
+        
+        for (i, j), (far_i, far_r, far_q) in tree.walk(
+                self.positions, self.velocities, self.params.interaction_cutoff, targets):
+            interacting, F_pairs = self._pair_forces(i, j)
+            i = np.concatenate([i[interacting], far_i])
+            F_pairs = np.concatenate([F_pairs, self._multipole_forces(far_i, far_r, far_q)])
+            for axis in range(self.dimension):
+                F[:, axis] += np.bincount(i, weights=F_pairs[:, axis], minlength=n)
+        return F
+    
+    def force_error_report(self, theta: Optional[float] = None,
+                           n_samples: int = 256,
+                           rng: Optional[Union[int, np.random.Generator]] = None) -> Dict:
+        """
+        Accuracy of the Barnes-Hut forces against the direct sum.
+        
+        The direct sum is evaluated only on a random sample of active
+        primitives, so the report stays affordable for large populations.
+        
+        Args:
+            theta: Opening angle to test (defaults to params.tree_theta)
+            n_samples: Number of sampled primitives
+            rng: Seed or Generator for the sample
+            
+        Returns:
+            Dictionary with the RMS and maximum relative force error, the
+            median per-primitive relative error, the time of one full tree
+            evaluation and the direct-sum time extrapolated from the sample
+        """
+        theta = self.params.tree_theta if theta is None else theta
+        index = np.flatnonzero(self.active)
+        rng = np.random.default_rng(rng)
+        sample = np.sort(rng.choice(index, size=min(n_samples, len(index)),
+                                    replace=False))
+        
+        start = time.perf_counter()
+        tree = ForceTree(self.box_size, theta, self.params.tree_leaf_size)
+        F_tree = self._tree_forces(tree)[sample]
+        tree_time = time.perf_counter() - start
+        
+        # Direct sum over every active partner, a few samples at a time
+        start = time.perf_counter()
+        F_direct = np.zeros((len(sample), self.dimension))
+        chunk = max(1, 2**20 // max(len(index), 1))
+        for lo in range(0, len(sample), chunk):
+            rows = sample[lo:lo + chunk]
+            i = np.repeat(rows, len(index))
+            j = np.tile(index, len(rows))
+            distinct = i != j
+            i, j = i[distinct], j[distinct]
+            interacting, F_pairs = self._pair_forces(i, j)
+            local = np.searchsorted(rows, i[interacting])
+            for axis in range(self.dimension):
+                F_direct[lo:lo + len(rows), axis] = np.bincount(
+                    local, weights=F_pairs[:, axis], minlength=len(rows))
+        direct_time = time.perf_counter() - start
+        
+        error = np.linalg.norm(F_tree - F_direct, axis=1)
+        magnitude = np.linalg.norm(F_direct, axis=1)
+        nonzero = magnitude > 0
+        
+        return {
+            'theta': theta,
+            'n_samples': len(sample),
+            'rms_relative_error': float(np.sqrt(np.sum(error**2) /
+                                                max(np.sum(magnitude**2), 1e-300))),
+            'max_relative_error': float(np.max(error[nonzero] / magnitude[nonzero],
+                                               initial=0.0)),
+            'median_relative_error': float(np.median(error[nonzero] / magnitude[nonzero]))
+                                     if nonzero.any() else 0.0,
+            'tree_time': tree_time,
+            'direct_time': direct_time * len(index) / max(len(sample), 1)
+        }
+    
+    def _annihilation_candidates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pairs (i < j) of active primitives that may lie within r_ann, sorted
+        by i then j.
+        
+        Reuses the force neighbor list when it is in use and r_ann does not
+        exceed the cutoff, so a step performs a single neighbor search;
+        otherwise runs a periodic cKDTree query_pairs(r_ann), or takes every
+        pair for small populations.
+        """
+        r_ann = self.params.r_ann
+        index = np.flatnonzero(self.active)
+        
+        if (self.force_kernel != 'tree' and not self._all_pairs() and
+                r_ann <= self.params.interaction_cutoff):
+            # Revalidate after the move; rebuilds only if the skin is used up
+            i, j = self._neighbor_pairs()
+            forward = i < j
+            return i[forward], j[forward]
+        
+        if len(index) <= self.all_pairs_max:
+            a, b = np.triu_indices(len(index), k=1)
+            return index[a], index[b]
+        
+        i, j = _periodic_pairs(self.positions, index, self.box_size, r_ann)
+        order = np.lexsort((j, i))
+        return i[order], j[order]
+    
     def _check_annihilation(self):
         """
         Check for Control-Chaos annihilations and remove pairs.
+        
+        Candidate pairs come from a spatial search (see
+        _annihilation_candidates); opposite-type pairs closer than r_ann are
+        then matched greedily in (i, j) order, so each primitive annihilates
+        with its first available partner exactly as in a scan over all j > i.
+        Each annihilated pair is appended to annihilation_log.
         """
         if not self.params.enable_annihilation:
             return
         
-        to_remove = set()
+        i, j = self._annihilation_candidates()
         
-        for i, pi in enumerate(self.primitives):
-            if not pi.active or pi.pid in to_remove:
-                continue
-            
-            for j, pj in enumerate(self.primitives):
-                if j <= i or not pj.active or pj.pid in to_remove:
-                    continue
-                
-                # Only opposite types annihilate
-                if pi.ptype == pj.ptype:
-                    continue
-                
-                # Check distance
-                r = pj.position - pi.position
-                r = self._minimum_image_separation(r)
-                dist = np.linalg.norm(r)
-                
-                if dist < self.params.r_ann:
-                    # Annihilation
-                    to_remove.add(pi.pid)
-                    to_remove.add(pj.pid)
-                    break
+        # Only opposite types annihilate
+        opposite = self.type_sign[i] != self.type_sign[j]
+        i, j = i[opposite], j[opposite]
+        
+        # Check distance
+        r = self.positions[j] - self.positions[i]
+        r = self._minimum_image_separation(r)
+        close = _rownorm(r) < self.params.r_ann
+        i, j = i[close], j[close]
+        
+        removed = np.zeros(len(self.pid), dtype=bool)
+        for a, b in zip(i.tolist(), j.tolist()):
+            if not (removed[a] or removed[b]):
+                # Annihilation
+                removed[a] = removed[b] = True
+                self.annihilation_log.append({
+                    'time': self.time,
+                    'step': self.step_count,
+                    'pid': int(self.pid[a]),
+                    'partner': int(self.pid[b]),
+                    'position': self.positions[a].copy()
+                })
         
         # Mark as inactive
-        for primitive in self.primitives:
-            if primitive.pid in to_remove:
-                primitive.active = False
+        self.active &= ~removed
     
-    def step(self):
+    def step(self, external_force: Optional[np.ndarray] = None):
         """
         Advance simulation by one time step.
         
         Uses velocity Verlet-like algorithm that maintains |v| = c.
+        
+        Args:
+            external_force: Optional extra force on each primitive, shape
+                (n_primitives, dimension) in row order (e.g. KRAM gradient
+                feedback); rows of inactive primitives are ignored. Build it
+                from the current arrays, since rows move on compaction
         """
+        self._check_views()
         dt = self.params.dt
         c = self.params.c
+        active = np.flatnonzero(self.active)
         
         # Store forces
-        forces = []
-        for primitive in self.primitives:
-            if primitive.active:
-                F = self._compute_total_force(primitive)
-                forces.append(F)
-            else:
-                forces.append(np.zeros(self.dimension))
+        F = self._compute_forces()[active]
         
-        # Update velocities and positions
-        for i, primitive in enumerate(self.primitives):
-            if not primitive.active:
-                continue
-            
-            F = forces[i]
-            
-            # Change in velocity direction (perpendicular component only)
-            # Since |v| = c is constant, force can only change direction
-            v = primitive.velocity
-            
-            # Perpendicular component of force
-            F_perp = F - np.dot(F, v) * v
-            
-            # Update velocity direction
-            dv = F_perp * dt / c  # Dimensionless
-            v_new = v + dv
-            
-            # Renormalize to maintain |v| = c
-            v_norm = np.linalg.norm(v_new)
-            if v_norm > 0:
-                primitive.velocity = v_new / v_norm
-            
-            # Update position
-            primitive.position += primitive.velocity * c * dt
-            primitive.position = self._apply_periodic_boundary(primitive.position)
+        if external_force is not None:
+            F += external_force[active]
         
-        # Check for annihilations
-        self._check_annihilation()
+        # Change in velocity direction (perpendicular component only)
+        # Since |v| = c is constant, force can only change direction
+        v = self.velocities[active]
+        
+        # Perpendicular component of force
+        F_perp = F - _rowdot(F, v)[:, None] * v
+        
+        # Update velocity direction
+        dv = F_perp * dt / c  # Dimensionless
+        v_new = v + dv
+        
+        # Renormalize to maintain |v| = c
+        v_norm = _rownorm(v_new)[:, None]
+        v = np.where(v_norm > 0, v_new / np.where(v_norm > 0, v_norm, 1.0), v)
+        self.velocities[active] = v
+        
+        # Update position
+        positions = self.positions[active] + v * c * dt
+        self.positions[active] = self._apply_periodic_boundary(positions)
         
         # Update time
         self.time += dt
         self.step_count += 1
+        
+        # Check for annihilations, then drop them once enough have piled up
+        self._check_annihilation()
+        self._maybe_compact()
     
     def evolve(self, n_steps: int, save_interval: int = 10):
         """
@@ -359,27 +1514,23 @@ class SolitonSimulator:
                 self._save_snapshot()
     
     def _save_snapshot(self):
-        """Save current state to history."""
+        """Save current state to history (arrays indexed like primitives)."""
         snapshot = {
             'time': self.time,
             'step': self.step_count,
-            'positions': [],
-            'velocities': [],
-            'types': [],
-            'active': []
+            'positions': self.positions.copy(),
+            'velocities': self.velocities.copy(),
+            'types': self.type_sign.copy(),
+            'active': self.active.copy(),
+            'pid': self.pid.copy()
         }
         
-        for p in self.primitives:
-            snapshot['positions'].append(p.position.copy())
-            snapshot['velocities'].append(p.velocity.copy())
-            snapshot['types'].append(p.ptype.value)
-            snapshot['active'].append(p.active)
-        
         self.history.append(snapshot)
     
     def get_active_primitives(self) -> List[Primitive]:
         """Return list of active primitives."""
-        return [p for p in self.primitives if p.active]
+        primitives = self.primitives
+        return [primitives[i] for i in np.flatnonzero(self.active)]
     
     def count_by_type(self) -> Tuple[int, int]:
         """
@@ -388,12 +1539,319 @@ class SolitonSimulator:
         Returns:
             n_control, n_chaos
         """
-        active = self.get_active_primitives()
-        n_control = sum(1 for p in active if p.ptype == PrimitiveType.CONTROL)
-        n_chaos = sum(1 for p in active if p.ptype == PrimitiveType.CHAOS)
+        active_signs = self.type_sign[self.active]
+        n_control = int(np.count_nonzero(active_signs == PrimitiveType.CONTROL.value))
+        n_chaos = int(np.count_nonzero(active_signs == PrimitiveType.CHAOS.value))
         return n_control, n_chaos
 
 
+class SolitonEnsemble:
+    """
+    R independent SolitonSimulator replicas advanced together.
+    
+    The replicas share the box and dimension but each has its own seed,
+    population and SolitonParameters (G, r_ann, dt, c, cutoff, ...). State is
+    held in padded arrays of shape (R, N_max, ...) with per-replica active
+    masks, and every step evaluates the all-pairs forces of all replicas in
+    one kernel (vectorized numpy, or a parallel numba loop over replicas and
+    primitives), so a sweep over many small systems keeps the CPU busy
+    instead of running R Python loops.
+    
+    Replica r starts from the same initial conditions as
+    SolitonSimulator(n_primitives[r], box_size, params[r], dimension, rng[r]);
+    with the numpy kernel it then follows that simulator bit for bit.
+    Padded and annihilated rows are inactive; the padding shrinks once the
+    largest live population has dropped by compact_fraction.
+    """
+    
+    # Pairs evaluated per batch of replicas (bounds the temporary arrays)
+    max_pairs = 2**20
+    
+    def __init__(self,
+                 n_primitives: Union[int, Sequence[int]],
+                 box_size: float,
+                 params: Sequence[SolitonParameters],
+                 dimension: int = 2,
+                 rng: Optional[Union[int, np.random.SeedSequence, np.random.Generator,
+                                     Sequence]] = None,
+                 force_kernel: str = 'numpy'):
+        """
+        Initialize the ensemble.
+        
+        Args:
+            n_primitives: Number of primitives, shared or one per replica
+            box_size: Size of periodic simulation box
+            params: Physical parameters, one per replica (R = len(params))
+            dimension: Spatial dimension (2 or 3)
+            rng: One seed, SeedSequence or Generator per replica, or a single
+                one from which R independent streams are spawned (fresh OS
+                entropy if None)
+            force_kernel: 'numpy', 'numba' (also used for annihilation) or
+                'auto'
+        """
+        self.force_kernel = _resolve_force_kernel(force_kernel)
+        if self.force_kernel == 'tree':
+            raise ValueError("SolitonEnsemble supports the 'numpy' and 'numba' kernels")
+        self.params = list(params)
+        self.n_replicas = R = len(self.params)
+        self.box_size = box_size
+        self.dimension = dimension
+        
+        if np.ndim(n_primitives) == 0:
+            n_primitives = [n_primitives] * R
+        if len(n_primitives) != R:
+            raise ValueError(f"Got {len(n_primitives)} populations for {R} replicas")
+        
+        if isinstance(rng, (list, tuple)):
+            if len(rng) != R:
+                raise ValueError(f"Got {len(rng)} seeds for {R} replicas")
+            seeds = list(rng)
+        elif isinstance(rng, np.random.Generator):
+            seeds = rng.spawn(R)
+        else:
+            seeds = np.random.SeedSequence(rng).spawn(R)
+        
+        # Per-replica parameters as arrays
+        self.c = np.array([p.c for p in self.params], dtype=float)
+        self.G = np.array([p.G for p in self.params], dtype=float)
+        self.r_ann = np.array([p.r_ann for p in self.params], dtype=float)
+        self.dt = np.array([p.dt for p in self.params], dtype=float)
+        self.cutoff = np.array([p.interaction_cutoff for p in self.params], dtype=float)
+        self.enable_annihilation = np.array([p.enable_annihilation for p in self.params])
+        self.compact_fraction = min(p.compact_fraction for p in self.params)
+        
+        # Padded state, filled from each replica's own initial conditions
+        n_max = max(n_primitives, default=0)
+        self.positions = np.zeros((R, n_max, dimension))
+        self.velocities = np.zeros((R, n_max, dimension))
+        self.velocities[..., 0] = 1.0
+        self.type_sign = np.ones((R, n_max), dtype=np.int8)
+        self.pid = np.full((R, n_max), -1, dtype=np.int64)
+        self.active = np.zeros((R, n_max), dtype=bool)
+        for r, (n, p, seed) in enumerate(zip(n_primitives, self.params, seeds)):
+            sim = SolitonSimulator(n, box_size, p, dimension, rng=seed)
+            self.positions[r, :n] = sim.positions
+            self.velocities[r, :n] = sim.velocities
+            self.type_sign[r, :n] = sim.type_sign
+            self.pid[r, :n] = sim.pid
+            self.active[r, :n] = sim.active
+        
+        # Tracking
+        self.time = np.zeros(R)
+        self.step_count = 0
+        self.history = []
+        self.annihilation_log = []
+        self.n_compactions = 0
+    
+    def _batches(self):
+        """Slices of replicas whose all-pairs arrays fit in max_pairs."""
+        n = self.positions.shape[1]
+        size = max(1, self.max_pairs // max(n * n, 1))
+        for lo in range(0, self.n_replicas, size):
+            yield slice(lo, lo + size)
+    
+    def _separations(self, batch: slice) -> np.ndarray:
+        """Minimum image x_j - x_i for every pair, shape (B, N, N, d)."""
+        x = self.positions[batch]
+        r = x[:, None, :, :] - x[:, :, None, :]
+        return r - self.box_size * np.round(r / self.box_size)
+    
+    def _compute_forces(self) -> np.ndarray:
+        """
+        Total perpendicular force on every primitive of every replica.
+        
+        The same per-pair arithmetic and skips as SolitonSimulator._pair_forces,
+        summed over j in ascending order.
+        
+        Returns:
+            Force array of shape (R, N, d); inactive rows are zero
+        """
+        F = np.zeros_like(self.positions)
+        if self.force_kernel == 'numba':
+            _numba_ensemble_forces(self.positions, self.velocities,
+                                   self.type_sign.astype(float), self.active,
+                                   float(self.box_size), self.cutoff, self.G, F)
+            return F
+        
+        n = self.positions.shape[1]
+        distinct = ~np.eye(n, dtype=bool)
+        
+        for batch in self._batches():
+            r = self._separations(batch)
+            r_norm = _rownorm(r)
+            
+            # Perpendicular component to i's velocity
+            v_i = self.velocities[batch][:, :, None, :]
+            r_perp = r - _rowdot(r, v_i)[..., None] * v_i
+            r_perp_norm = _rownorm(r_perp)
+            
+            active = self.active[batch]
+            interacting = (active[:, :, None] & active[:, None, :] & distinct &
+                           (r_norm <= self.cutoff[batch, None, None]) &
+                           (r_norm >= 0.01) & (r_perp_norm >= 0.01))
+            r_perp_norm = np.where(interacting, r_perp_norm, 1.0)
+            
+            sign = self.type_sign[batch].astype(float)
+            F_mag = (self.G[batch, None, None] * sign[:, :, None] * sign[:, None, :]
+                     / np.float_power(r_perp_norm, 2))
+            F_mag = np.where(interacting, F_mag, 0.0)
+            F[batch] = np.sum(F_mag[..., None] * r_perp / r_perp_norm[..., None], axis=2)
+        return F
+    
+    def _check_annihilation(self):
+        """
+        Annihilate Control-Chaos pairs closer than each replica's r_ann.
+        
+        Pairs are matched greedily in (i, j) order within every replica, as
+        in SolitonSimulator._check_annihilation.
+        """
+        if self.force_kernel == 'numba':
+            partner = np.full(self.active.shape, -1, dtype=np.intp)
+            _numba_ensemble_annihilation(self.positions, self.type_sign,
+                                         self.active & self.enable_annihilation[:, None],
+                                         float(self.box_size), self.r_ann, partner)
+            pairs = zip(*np.nonzero(partner > np.arange(partner.shape[1])))
+            pairs = [(b, i, partner[b, i]) for b, i in pairs]
+        else:
+            pairs = self._annihilation_pairs()
+        
+        for b, i, j in pairs:
+            self.annihilation_log.append({
+                'replica': int(b),
+                'time': float(self.time[b]),
+                'step': self.step_count,
+                'pid': int(self.pid[b, i]),
+                'partner': int(self.pid[b, j]),
+                'position': self.positions[b, i].copy()
+            })
+            self.active[b, i] = self.active[b, j] = False
+    
+    def _annihilation_pairs(self) -> List[Tuple[int, int, int]]:
+        """Greedily matched (replica, i, j) annihilation pairs, numpy path."""
+        n = self.positions.shape[1]
+        upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+        removed = np.zeros_like(self.active)
+        pairs = []
+        
+        for batch in self._batches():
+            r_norm = _rownorm(self._separations(batch))
+            active = self.active[batch] & self.enable_annihilation[batch, None]
+            sign = self.type_sign[batch]
+            close = (active[:, :, None] & active[:, None, :] & upper &
+                     (sign[:, :, None] != sign[:, None, :]) &
+                     (r_norm < self.r_ann[batch, None, None]))
+            
+            for b, i, j in zip(*np.nonzero(close)):
+                b += batch.start
+                if not (removed[b, i] or removed[b, j]):
+                    removed[b, i] = removed[b, j] = True
+                    pairs.append((b, i, j))
+        return pairs
+    
+    def compact(self):
+        """
+        Move each replica's active rows to the front (keeping their order)
+        and trim the padding to the largest live population.
+        """
+        order = np.argsort(~self.active, axis=1, kind='stable')
+        width = int(np.count_nonzero(self.active, axis=1).max(initial=0))
+        order = order[:, :width]
+        
+        self.positions = np.take_along_axis(self.positions, order[..., None], axis=1)
+        self.velocities = np.take_along_axis(self.velocities, order[..., None], axis=1)
+        self.type_sign = np.take_along_axis(self.type_sign, order, axis=1)
+        self.pid = np.take_along_axis(self.pid, order, axis=1)
+        self.active = np.take_along_axis(self.active, order, axis=1)
+        self.pid[~self.active] = -1
+        self.n_compactions += 1
+    
+    def step(self):
+        """Advance every replica by one of its own time steps."""
+        dt = self.dt[:, None, None]
+        c = self.c[:, None, None]
+        active = self.active[..., None]
+        
+        F = self._compute_forces()
+        
+        # Perpendicular component of force (|v| = c is kept)
+        v = self.velocities
+        F_perp = F - _rowdot(F, v)[..., None] * v
+        
+        # Update velocity direction and renormalize
+        dv = F_perp * dt / c
+        v_new = v + dv
+        v_norm = _rownorm(v_new)[..., None]
+        v = np.where(v_norm > 0, v_new / np.where(v_norm > 0, v_norm, 1.0), v)
+        self.velocities = np.where(active, v, self.velocities)
+        
+        # Update position
+        positions = (self.positions + self.velocities * c * dt) % self.box_size
+        self.positions = np.where(active, positions, self.positions)
+        
+        # Update time
+        self.time += self.dt
+        self.step_count += 1
+        
+        # Check for annihilations, then trim the padding once it is mostly dead
+        self._check_annihilation()
+        n = self.positions.shape[1]
+        n_live = int(np.count_nonzero(self.active, axis=1).max(initial=0))
+        if n_live < n and n - n_live >= self.compact_fraction * n:
+            self.compact()
+    
+    def evolve(self, n_steps: int, save_interval: int = 10):
+        """
+        Evolve all replicas for multiple steps.
+        
+        Args:
+            n_steps: Number of steps
+            save_interval: Save state every N steps
+        """
+        for i in range(n_steps):
+            self.step()
+            
+            if i % save_interval == 0:
+                self._save_snapshot()
+    
+    def _save_snapshot(self):
+        """Save current state to history (arrays of shape (R, N, ...))."""
+        snapshot = {
+            'time': self.time.copy(),
+            'step': self.step_count,
+            'positions': self.positions.copy(),
+            'velocities': self.velocities.copy(),
+            'types': self.type_sign.copy(),
+            'active': self.active.copy(),
+            'pid': self.pid.copy()
+        }
+        
+        self.history.append(snapshot)
+    
+    def replica_primitives(self, replica: int) -> List[Primitive]:
+        """
+        Primitives of one replica (a copy of its current state), e.g. for
+        ClusterAnalyzer.
+        """
+        rows = self.pid[replica] >= 0
+        store = _PrimitiveArrays(self.positions[replica, rows],
+                                 self.velocities[replica, rows],
+                                 self.type_sign[replica, rows],
+                                 self.pid[replica, rows],
+                                 self.active[replica, rows])
+        return [Primitive._view(store, i) for i in range(len(store.pid))]
+    
+    def count_by_type(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count active primitives by type in every replica.
+        
+        Returns:
+            n_control, n_chaos: Arrays of shape (R,)
+        """
+        control = self.active & (self.type_sign == PrimitiveType.CONTROL.value)
+        chaos = self.active & (self.type_sign == PrimitiveType.CHAOS.value)
+        return np.count_nonzero(control, axis=1), np.count_nonzero(chaos, axis=1)
+
+
 class ClusterAnalyzer:
     """
     Analyzes primitive distributions for soliton (cluster) formation.
@@ -676,20 +2134,22 @@ def example_parameter_sweep():
     G_values = [0.1, 0.3, 0.5, 0.7, 1.0]
     results = []
     
-    for G in G_values:
+    # All G values advance together as replicas of one ensemble
+    ensemble = SolitonEnsemble(
+        n_primitives=80,
+        box_size=20.0,
+        params=[SolitonParameters(c=1.0, G=G, dt=0.01) for G in G_values],
+        dimension=2,
+        force_kernel='auto'
+    )
+    
+    ensemble.evolve(n_steps=500, save_interval=100)
+    
+    for replica, G in enumerate(G_values):
         print(f"\nTesting G={G:.2f}...")
         
-        sim = SolitonSimulator(
-            n_primitives=80,
-            box_size=20.0,
-            params=SolitonParameters(c=1.0, G=G, dt=0.01),
-            dimension=2
-        )
-        
-        sim.evolve(n_steps=500, save_interval=100)
-        
         analyzer = ClusterAnalyzer()
-        clusters = analyzer.find_clusters(sim.primitives, eps=2.0)
+        clusters = analyzer.find_clusters(ensemble.replica_primitives(replica), eps=2.0)
         
         n_clusters = len(clusters)
         max_cluster_size = max([len(c) for c in clusters]) if clusters else 0
@@ -711,6 +2171,36 @@ def example_parameter_sweep():
     return results
 
 
+def example_tree_accuracy():
+    """Example: Barnes-Hut force error against the direct sum."""
+    print("\nExample 4: Tree Force Accuracy")
+    print("=" * 70)
+    
+    sim = SolitonSimulator(
+        n_primitives=5000,
+        box_size=20.0,
+        params=SolitonParameters(c=1.0, G=0.3, interaction_cutoff=10.0),
+        dimension=2,
+        rng=0,
+        force_kernel='tree'
+    )
+    
+    # Compile the tree walk before timing it
+    sim._compute_forces()
+    
+    print("theta  RMS error  Max error  Tree time  Direct time")
+    print("-" * 55)
+    reports = []
+    for theta in [0.3, 0.5, 0.8]:
+        report = sim.force_error_report(theta=theta, n_samples=128, rng=0)
+        reports.append(report)
+        print(f"{theta:.1f}    {report['rms_relative_error']:.2e}   "
+              f"{report['max_relative_error']:.2e}   {report['tree_time']:.3f}s     "
+              f"{report['direct_time']:.3f}s")
+    
+    return reports
+
+
 if __name__ == "__main__":
     print("=" * 70)
     print("Soliton Dynamics Module - Test Suite")
@@ -721,6 +2211,7 @@ if __name__ == "__main__":
     sim1, clusters1 = example_random_initialization()
     sim2 = example_controlled_soliton_formation()
     results = example_parameter_sweep()
+    reports = example_tree_accuracy()
     
     print("\n" + "=" * 70)
     print("Examples completed successfully!")
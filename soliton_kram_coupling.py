@@ -0,0 +1,274 @@
+"""
+Soliton-KRAM Coupling
+=====================
+
+Co-simulation driver linking the primitive N-body dynamics
+(soliton-dynamics-code.py) to the KRAM field (kram-evolution-code.py).
+
+Each coupled step of length Δt:
+    1. Deposits the active primitives as one imprint current
+           J(x) = A Σ_i σ_i exp(-|x - x_i|² / 2w²)
+       through a single ParticleDeposition call
+    2. Advances the KRAM field by Δt with J held fixed
+    3. Optionally samples ∇g_M once at the primitive positions and applies
+           F_i = λ σ_i ∇g_M(x_i)
+       as an extra force while the primitives advance by Δt
+
+When the two timesteps differ the faster system is sub-cycled, so Δt must be
+an integer multiple of both the solver and the simulator timestep. The driver
+reads particle state only through the simulator's array views (positions,
+type_sign, active), never per-primitive objects.
+
+The periodic soliton box [0, L)^d is mapped onto the periodic KRAM grid, so
+the two systems may use different length units.
+
+Usage:
+    coupled = CoupledSolitonKRAM(sim, solver,
+                                 CouplingParameters(feedback_strength=0.5))
+    coupled.evolve(n_steps=1000)
+
+Author: David Noel Lynch
+Date: 2025
+License: MIT
+"""
+
+import importlib.util
+import os
+import numpy as np
+from typing import Optional, Callable, Union
+from dataclasses import dataclass
+
+from imprint_library import ParticleDeposition
+
+
+@dataclass
+class CouplingParameters:
+    """
+    Parameters of the soliton-KRAM coupling.
+
+    Attributes:
+        imprint_amplitude: Peak imprint A per primitive (signed by σ_i)
+        imprint_width: Imprint width w in simulator length units
+        deposition: Deposition method ('cic', 'gaussian' or 'spectral')
+        truncate: Gaussian stencil half-width in units of imprint_width
+        feedback_strength: λ in F_i = λ σ_i ∇g_M(x_i) (0 disables feedback)
+        coupling_dt: Coupled step Δt (defaults to the larger timestep)
+        scheme: KRAM time-stepping scheme used for the sub-steps
+    """
+    imprint_amplitude: float = 1.0
+    imprint_width: float = 0.5
+    deposition: str = 'gaussian'
+    truncate: float = 4.0
+    feedback_strength: float = 0.0
+    coupling_dt: Optional[float] = None
+    scheme: str = 'imex_euler'
+
+
+def _substeps(dt: float, dt_sub: float, name: str) -> int:
+    """Number of sub-steps of length dt_sub in one coupled step dt."""
+    n = int(round(dt / dt_sub))
+    if n < 1 or abs(n * dt_sub - dt) > 1e-9 * dt:
+        raise ValueError(f"Coupling step {dt} is not an integer multiple of "
+                         f"the {name} timestep {dt_sub}")
+    return n
+
+
+class CoupledSolitonKRAM:
+    """
+    Co-simulation of a SolitonSimulator and a KRAMSolver.
+    """
+
+    def __init__(self,
+                 simulator,
+                 solver,
+                 params: Optional[CouplingParameters] = None,
+                 J_background: Optional[Union[np.ndarray,
+                                              Callable[[float], np.ndarray]]] = None):
+        """
+        Initialize the coupled system.
+
+        Args:
+            simulator: SolitonSimulator advanced with the KRAM feedback force
+            solver: Single-field KRAMSolver whose grid covers the soliton box
+            params: Coupling parameters
+            J_background: Static imprint (array) or J(t) callable added to the
+                deposited particle current, e.g. a vacuum lattice
+        """
+        self.simulator = simulator
+        self.solver = solver
+        self.params = params or CouplingParameters()
+        self.J_background = J_background
+
+        self.grid_shape = tuple(solver.grid_shape)
+        self.ndim = len(self.grid_shape)
+        if solver.g_M.shape != self.grid_shape:
+            raise ValueError("Coupling needs a single-field solver holding the "
+                             f"full grid; got field shape {solver.g_M.shape}")
+        if self.ndim != simulator.dimension:
+            raise ValueError(f"KRAM grid is {self.ndim}D but the simulator is "
+                             f"{simulator.dimension}D")
+
+        # Simulator length units -> grid units, and KRAM length per simulator length
+        self._to_grid = np.array(self.grid_shape) / simulator.box_size
+        length_scale = self._to_grid * solver.params.dx
+        if not np.allclose(length_scale, length_scale[0]):
+            raise ValueError("The KRAM grid must cover the soliton box with the "
+                             "same resolution along every axis")
+        self._length_scale = float(length_scale[0])
+
+        self.deposition = ParticleDeposition(
+            self.grid_shape, solver.params.dx,
+            method=self.params.deposition,
+            width=self.params.imprint_width * self._length_scale,
+            truncate=self.params.truncate,
+            fft_backend=solver.fft,
+            dtype=solver.dtype)
+
+        # Sub-cycling of the faster system
+        dt_kram = float(solver.params.dt)
+        dt_sim = float(simulator.params.dt)
+        self.dt = self.params.coupling_dt or max(dt_kram, dt_sim)
+        self.n_kram_substeps = _substeps(self.dt, dt_kram, 'KRAM')
+        self.n_sim_substeps = _substeps(self.dt, dt_sim, 'simulator')
+
+        self.step_count = 0
+        self.J_imprint = np.zeros(self.grid_shape, dtype=solver.dtype)
+
+    @property
+    def time(self) -> float:
+        """Coupled time elapsed since construction."""
+        return self.step_count * self.dt
+
+    def deposit(self) -> np.ndarray:
+        """
+        Deposit the active primitives (plus any background) as J_imprint.
+
+        Returns:
+            Imprint current on the KRAM grid
+        """
+        active = self.simulator.active
+        charges = self.params.imprint_amplitude * self.simulator.type_sign[active]
+        J = self.deposition.deposit(self.simulator.positions[active] * self._to_grid,
+                                    charges, out=self.J_imprint)
+
+        if self.J_background is not None:
+            background = self.J_background
+            if callable(background):
+                background = background(self.solver.t)
+            J += background
+        return J
+
+    def feedback_force(self) -> np.ndarray:
+        """
+        KRAM feedback force F_i = λ σ_i ∇g_M(x_i) on every primitive.
+
+        The gradient is a periodic central difference of g_M sampled by one
+        cloud-in-cell interpolation; rows of inactive primitives are zero.
+
+        Returns:
+            Force array of shape (n_primitives, dimension), simulator units
+        """
+        g = self.solver.g_M
+        dx = self.solver.params.dx
+        grad = np.stack([(np.roll(g, -1, axis) - np.roll(g, 1, axis)) / (2 * dx)
+                         for axis in range(self.ndim)])
+
+        active = self.simulator.active
+        positions = self.simulator.positions
+        force = np.zeros_like(positions)
+
+        # ∂g/∂x_sim = ∂g/∂x_kram * (KRAM length per simulator length)
+        grad_at = self.deposition.interpolate(grad, positions[active] * self._to_grid)
+        sigma = self.simulator.type_sign[active]
+        force[active] = (self.params.feedback_strength * self._length_scale
+                         * sigma[:, None] * grad_at)
+        return force
+
+    def step(self):
+        """Advance both systems by one coupled step Δt."""
+        J = self.deposit()
+        self.solver.evolve(n_steps=self.n_kram_substeps,
+                           J_imprint_func=lambda t: J,
+                           scheme=self.params.scheme)
+
+        force = self.feedback_force() if self.params.feedback_strength else None
+        pid = self.simulator.pid
+        for _ in range(self.n_sim_substeps):
+            if force is not None and len(force) != len(self.simulator.pid):
+                # The simulator compacted; keep the rows still stored
+                force = force[self.simulator.index_of(pid) >= 0]
+                pid = self.simulator.pid
+            self.simulator.step(external_force=force)
+
+        self.step_count += 1
+
+    def evolve(self,
+               n_steps: int,
+               callback: Optional[Callable[['CoupledSolitonKRAM'], None]] = None):
+        """
+        Advance the coupled system for several coupled steps.
+
+        Args:
+            n_steps: Number of coupled steps
+            callback: Called as callback(self) after every coupled step
+        """
+        for _ in range(n_steps):
+            self.step()
+            if callback is not None:
+                callback(self)
+
+
+# ============================================================================
+# Example Usage
+# ============================================================================
+
+def _load_sibling(module_name: str, filename: str):
+    """Import one of the hyphenated simulation scripts next to this file."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def example_coupled_run():
+    """Example: primitives imprinting a KRAM field that pushes back on them."""
+    print("Example: Coupled Soliton-KRAM Run")
+    print("=" * 70)
+
+    kram = _load_sibling('kram_evolution', 'kram-evolution-code.py')
+    soliton = _load_sibling('soliton_dynamics', 'soliton-dynamics-code.py')
+
+    sim = soliton.SolitonSimulator(
+        n_primitives=60,
+        box_size=20.0,
+        params=soliton.SolitonParameters(c=1.0, G=0.3, r_ann=0.15, dt=0.01),
+        dimension=2,
+        rng=0
+    )
+    solver = kram.KRAMSolver(
+        grid_shape=(64, 64),
+        params=kram.KRAMParameters(tau_M=1.0, xi_squared=0.5, mu_squared=0.1,
+                                   beta=1.0, dt=0.02, noise_amplitude=0.0),
+    )
+
+    coupled = CoupledSolitonKRAM(
+        sim, solver,
+        CouplingParameters(imprint_amplitude=1.0, imprint_width=0.5,
+                           feedback_strength=0.5)
+    )
+    print(f"Coupled step {coupled.dt}: {coupled.n_kram_substeps} KRAM step(s), "
+          f"{coupled.n_sim_substeps} simulator step(s)")
+
+    coupled.evolve(n_steps=100)
+
+    n_c, n_x = sim.count_by_type()
+    print(f"Time: {coupled.time:.2f}")
+    print(f"Active primitives: {n_c} Control, {n_x} Chaos")
+    print(f"<g_M²> = {np.mean(solver.g_M**2):.4e}")
+
+    return coupled
+
+
+if __name__ == "__main__":
+    example_coupled_run()